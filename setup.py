@@ -7,7 +7,8 @@ from setuptools import setup, find_packages
 ##########
 
 NAME = 'txboto'
-PACKAGES = find_packages()
+PACKAGES = find_packages(include=['txboto', 'txboto.*'],
+                         exclude=['tests', 'tests.*'])
 META_PATH = os.path.join("txboto", "__init__.py")
 CLASSIFIERS = [
     "Development Status :: 4 - Beta",
@@ -47,19 +48,18 @@ def read(*parts):
 
 
 META_FILE = read(META_PATH)
+META_RE = re.compile(r"^__(\w+)__ = ['\"]([^'\"]*)['\"]", re.M)
+META = dict(META_RE.findall(META_FILE))
 
 
 def find_meta(meta):
     """
     Extract __*meta*__ from META_FILE.
     """
-    meta_match = re.search(
-        r"^__{meta}__ = ['\"]([^'\"]*)['\"]".format(meta=meta),
-        META_FILE, re.M
-    )
-    if meta_match:
-        return meta_match.group(1)
-    raise RuntimeError("Unable to find __{meta}__ string.".format(meta=meta))
+    try:
+        return META[meta]
+    except KeyError:
+        raise RuntimeError("Unable to find __{meta}__ string.".format(meta=meta))
 
 
 if __name__ == '__main__':
@@ -34,13 +34,12 @@
 
 
 from txboto.pyami.config import Config
-import txboto.plugin
-import datetime
 import os
 import platform
 import re
 import logging
 import logging.config
+from logging import NullHandler  # noqa
 
 from twisted.python import log as twisted_log
 
@@ -56,7 +55,8 @@ __email__ = "michael@silveregg.co.jp"
 __license__ = "BSD-3"
 
 # http://bugs.python.org/issue7980
-datetime.datetime.strptime('', '')
+# Import _strptime up front so threads never race on its lazy import.
+import _strptime  # noqa
 
 UserAgent = 'TxBoto/%s Python/%s %s/%s' % (
     __version__,
@@ -76,18 +76,15 @@ VERSION_RE = re.compile('(?P<versionless_uri_str>.+)#(?P<version_id>.+)$')
 ENDPOINTS_PATH = os.path.join(os.path.dirname(__file__), 'endpoints.json')
 
 
-class NullHandler(logging.Handler):
-    def emit(self, record):
-        pass
-
-
 class TwistedHandler(logging.Handler):
 
     def handle(self, record):
+        if record.levelno < self.level:
+            return
         self.emit(record)
 
     def emit(self, record):
-        msg = repr('[{}] {}'.format(record.name, record.msg))
+        msg = '[%s] %s' % (record.name, record.getMessage())
         twisted_log.msg(msg, logLevel=record.levelno)
 
 
@@ -99,33 +96,35 @@ perflog.addHandler(TwistedHandler())
 
 # convenience function to set logging to a particular file
 
+# Handlers installed by set_file_logger/set_stream_logger, keyed by logger
+# name, so that calling them again replaces the handler instead of adding one.
+_logger_handlers = {}
 
-def set_file_logger(name, filepath, level=logging.INFO, format_string=None):
+
+def _set_logger(name, handler, level, format_string):
     global log
     if not format_string:
         format_string = "%(asctime)s %(name)s [%(levelname)s]:%(message)s"
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    fh = logging.FileHandler(filepath)
-    fh.setLevel(level)
-    formatter = logging.Formatter(format_string)
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(format_string))
+    previous = _logger_handlers.pop(name, None)
+    if previous is not None:
+        logger.removeHandler(previous)
+        previous.close()
+    logger.addHandler(handler)
+    _logger_handlers[name] = handler
     log = logger
 
 
+def set_file_logger(name, filepath, level=logging.INFO, format_string=None):
+    _set_logger(name, logging.FileHandler(filepath, delay=True), level,
+                format_string)
+
+
 def set_stream_logger(name, level=logging.DEBUG, format_string=None):
-    global log
-    if not format_string:
-        format_string = "%(asctime)s %(name)s [%(levelname)s]:%(message)s"
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    fh = logging.StreamHandler()
-    fh.setLevel(level)
-    formatter = logging.Formatter(format_string)
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
-    log = logger
+    _set_logger(name, logging.StreamHandler(), level, format_string)
 
 
 def connect_dynamodb(aws_access_key_id=None,
@@ -183,5 +182,3 @@ def connect_kinesis(aws_access_key_id=None,
         aws_secret_access_key=aws_secret_access_key,
         **kwargs
     )
-
-txboto.plugin.load_plugins(config)
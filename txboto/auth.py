@@ -137,6 +137,7 @@ class HmacAuthV1Handler(AuthHandler, HmacKeys):
     """    Implements the HMAC request signing used by S3 and GS."""
 
     capability = ['hmac-v1', 's3']
+    SignsInHeaders = True
 
     def __init__(self, host, config, provider):
         AuthHandler.__init__(self, host, config, provider)
@@ -173,6 +174,7 @@ class HmacAuthV2Handler(AuthHandler, HmacKeys):
     Implements the simplified HMAC authorization used by CloudFront.
     """
     capability = ['hmac-v2', 'cloudfront']
+    SignsInHeaders = True
 
     def __init__(self, host, config, provider):
         AuthHandler.__init__(self, host, config, provider)
@@ -202,6 +204,7 @@ class HmacAuthV3Handler(AuthHandler, HmacKeys):
     """Implements the new Version 3 HMAC authorization used by Route53."""
 
     capability = ['hmac-v3', 'route53', 'ses']
+    SignsInHeaders = True
 
     def __init__(self, host, config, provider):
         AuthHandler.__init__(self, host, config, provider)
@@ -228,6 +231,7 @@ class HmacAuthV3HTTPHandler(AuthHandler, HmacKeys):
     """
 
     capability = ['hmac-v3-http']
+    SignsInHeaders = True
 
     def __init__(self, host, config, provider):
         AuthHandler.__init__(self, host, config, provider)
@@ -303,6 +307,9 @@ class HmacAuthV4Handler(AuthHandler, HmacKeys):
     """
 
     capability = ['hmac-v4']
+    SignsInHeaders = True
+
+    _signing_key_cache = None
 
     def __init__(self, host, config, provider,
                  service_name=None, region_name=None):
@@ -490,14 +497,29 @@ class HmacAuthV4Handler(AuthHandler, HmacKeys):
         sts.append(sha256(canonical_request.encode('utf-8')).hexdigest())
         return '\n'.join(sts)
 
-    def signature(self, http_request, string_to_sign):
+    def signing_key(self, http_request):
+        """
+        Return the derived SigV4 signing key for the request's date, region
+        and service.  The key only changes daily, so the last one derived is
+        kept and reused while its inputs stay the same.
+        """
         key = self._provider.secret_key
+        cache_key = (key, http_request.timestamp, http_request.region_name,
+                     http_request.service_name)
+        cached = self._signing_key_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
         k_date = self._sign(('AWS4' + key).encode('utf-8'),
                             http_request.timestamp)
         k_region = self._sign(k_date, http_request.region_name)
         k_service = self._sign(k_region, http_request.service_name)
         k_signing = self._sign(k_service, 'aws4_request')
-        return self._sign(k_signing, string_to_sign, hex=True)
+        self._signing_key_cache = (cache_key, k_signing)
+        return k_signing
+
+    def signature(self, http_request, string_to_sign):
+        return self._sign(self.signing_key(http_request), string_to_sign,
+                          hex=True)
 
     def add_auth(self, req, **kwargs):
         """
@@ -982,6 +1004,9 @@ def get_auth_handler(host, config, provider, requested_capability=None):
     Raises:
         txboto.exception.NoAuthHandlerFound
     """
+    # Plugins are only needed once a handler has to be picked, so they are
+    # loaded here rather than when txboto is imported.
+    txboto.plugin.load_plugins(config)
     ready_handlers = []
     auth_handlers = txboto.plugin.get_plugin(AuthHandler, requested_capability)
     for handler in auth_handlers:
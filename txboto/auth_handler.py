@@ -43,6 +43,10 @@ class AuthHandler(Plugin):
 
     capability = []
 
+    SignsInHeaders = False
+    """Whether add_auth leaves the request params alone and signs with
+    headers only, so that a signed request can be reused as is."""
+
     def __init__(self, host, config, provider):
         """Constructs the handlers.
         :type host: string
@@ -34,31 +34,85 @@ from __future__ import absolute_import
 
 from treq.client import HTTPClient
 
-from twisted.internet import reactor, error
+from twisted.internet import defer, error
 from twisted.web import error as web_error
 from twisted.web.client import Agent, ProxyAgent, HTTPConnectionPool, \
     ResponseFailed, RequestTransmissionFailed, ResponseNeverReceived
 
 from txboto import UserAgent, config, log
-from txboto.compat import six, quote
+from txboto.compat import six, quote_from_bytes
 
 from OpenSSL import SSL
 
+_TEXT_TYPE = six.text_type
+
+# Characters left unescaped when quoting unicode header values.
+_QUOTE_SAFE = b'!"#$%&\'()*+,/:;<=>?@[\\]^`{|}~'
+
+
+# Shared [client, pool, users] entries, keyed by (persistent, proxy,
+# proxy_port), so that connections going through the same route also share a
+# connection pool.  users counts the connections that have not been closed.
+_httpclients = {}
+
 
 def httpclient(*args, **kwargs):
+    return _shared_httpclient(**kwargs)[1][0]
+
+
+def _shared_httpclient(**kwargs):
+    key = (kwargs.get('persistent', True), kwargs.get('proxy'),
+           kwargs.get('proxy_port'))
+    entry = _httpclients.get(key)
+    if entry is None:
+        client, pool = _build_httpclient(**kwargs)
+        entry = _httpclients[key] = [client, pool, 0]
+    return key, entry
+
+
+def _release_httpclient(key):
+    """
+    Drop a connection's use of the shared entry under ``key``, closing the
+    pool's idle connections once no connection uses it any more.
+    """
+    entry = _httpclients.get(key)
+    if entry is None:
+        return defer.succeed(None)
+    entry[2] -= 1
+    if entry[2] > 0:
+        return defer.succeed(None)
+    del _httpclients[key]
+    return entry[1].closeCachedConnections()
+
+
+def _build_httpclient(**kwargs):
+    # The reactor is imported here rather than at module level so that
+    # importing txboto does not install the default reactor before the
+    # application had a chance to pick its own.
+    from twisted.internet import reactor
 
     pool = HTTPConnectionPool(reactor, kwargs.get('persistent', True))
+    pool.maxPersistentPerHost = config.getint('TxBoto',
+                                              'max_persistent_per_host', 10)
+    pool.cachedConnectionTimeout = config.getint(
+        'TxBoto', 'cached_connection_timeout', pool.cachedConnectionTimeout)
 
     if 'proxy' in kwargs and 'proxy_port' in kwargs:
         endpoint = '{}:{}'.format(kwargs['proxy'], kwargs['proxy_port'])
         agent = ProxyAgent(endpoint, reactor=reactor, pool=pool)
     else:
         agent = Agent(reactor=reactor, pool=pool)
-    return HTTPClient(agent)
+    return HTTPClient(agent), pool
 
 
 class HTTPRequest(object):
 
+    # timestamp, service_name and region_name are filled in by the SigV4
+    # auth handlers, start_time by the connection when the request is sent.
+    __slots__ = ('method', 'protocol', 'host', 'port', '_path', 'auth_path',
+                 'params', 'headers', 'body', '_url', '_headers_quoted',
+                 'timestamp', 'service_name', 'region_name', 'start_time')
+
     def __init__(self, method, protocol, host, port, path, auth_path,
                  params, headers, body):
         """Represents an HTTP request.
@@ -105,16 +159,31 @@ class HTTPRequest(object):
         self.auth_path = auth_path
         self.params = params
         # chunked Transfer-Encoding should act only on PUT request.
-        if headers and 'Transfer-Encoding' in headers and \
-                headers['Transfer-Encoding'] == 'chunked' and \
+        if headers and headers.get('Transfer-Encoding') == 'chunked' and \
                 self.method != 'PUT':
-            self.headers = headers.copy()
-            del self.headers['Transfer-Encoding']
+            self.headers = {k: v for k, v in headers.items()
+                            if k != 'Transfer-Encoding'}
         else:
             self.headers = headers
         self.body = body
-        self.url = '{}://{}:{}{}'.format(self.protocol, self.host, self.port,
-                                         self.path)
+        self._headers_quoted = False
+
+    # The url is built on first use and rebuilt whenever the path changes,
+    # e.g. when an auth handler appends a signed query string to it.
+    def _get_path(self):
+        return self._path
+
+    def _set_path(self, value):
+        self._path = value
+        self._url = None
+    path = property(_get_path, _set_path)
+
+    @property
+    def url(self):
+        if self._url is None:
+            self._url = '%s://%s:%s%s' % (self.protocol, self.host, self.port,
+                                          self.path)
+        return self._url
 
     def __str__(self):
         return (('method:(%s) protocol:(%s) host(%s) port(%s) path(%s) '
@@ -123,13 +192,13 @@ class HTTPRequest(object):
                 self.headers, self.body))
 
     def authorize(self, connection, **kwargs):
-        if not getattr(self, '_headers_quoted', False):
-            for key in self.headers:
-                val = self.headers[key]
-                if isinstance(val, six.text_type):
-                    safe = '!"#$%&\'()*+,/:;<=>?@[\\]^`{|}~'
-                    self.headers[key] = quote(val.encode('utf-8'), safe)
-            setattr(self, '_headers_quoted', True)
+        if not self._headers_quoted:
+            headers = self.headers
+            for key, val in headers.items():
+                if isinstance(val, _TEXT_TYPE):
+                    headers[key] = quote_from_bytes(val.encode('utf-8'),
+                                                    _QUOTE_SAFE)
+            self._headers_quoted = True
 
         self.headers['User-Agent'] = UserAgent
 
@@ -145,6 +214,19 @@ class HTTPRequest(object):
 
 class AWSBaseConnection(object):
 
+    http_exceptions = (error.ConnectError, web_error.Error,
+                       error.ConnectionDone, error.ConnectionLost,
+                       error.ConnectionRefusedError,
+                       error.ConnectingCancelledError,
+                       error.TimeoutError,
+                       ResponseFailed, RequestTransmissionFailed,
+                       ResponseNeverReceived)
+
+    # define subclasses of the above that are not retryable.
+    http_unretryable_exceptions = (SSL.Error,
+                                   error.CertificateError,
+                                   error.VerifyError)
+
     def __init__(self, aws_access_key_id, aws_secret_access_key,
                  host, port=None, is_secure=True,
                  proxy=None, proxy_port=None,
@@ -174,42 +256,38 @@ class AWSBaseConnection(object):
             kw['proxy'] = proxy
             kw['proxy_port'] = proxy_port
 
-        self.client = httpclient(**kw)
-
-        self.http_exceptions = (error.ConnectError, web_error.Error,
-                                error.ConnectionDone, error.ConnectionLost,
-                                error.ConnectionRefusedError,
-                                error.ConnectingCancelledError,
-                                error.TimeoutError,
-                                ResponseFailed, RequestTransmissionFailed,
-                                ResponseNeverReceived)
-
-        # define subclasses of the above that are not retryable.
-        self.http_unretryable_exceptions = (SSL.Error,
-                                            error.CertificateError,
-                                            error.VerifyError)
+        self._httpclient_key, entry = _shared_httpclient(**kw)
+        self.client, self.pool = entry[0], entry[1]
+        entry[2] += 1
         self.request_hook = None
         self.timeout = 60
 
+    def close(self):
+        """
+        Release this connection's pool.
+
+        The pool is shared with other connections using the same route, so
+        its idle persistent connections are only closed once the last of
+        them is closed.
+
+        :rtype: :class:`twisted.internet.defer.Deferred`
+        """
+        key, self._httpclient_key = self._httpclient_key, None
+        if key is None:
+            return defer.succeed(None)
+        return _release_httpclient(key)
+
     def send_request(self, http_request):
 
-        headers = {}
-        for k, v in http_request.headers.items():
-            if six.PY3:
-                headers[k] = v.encode("utf-8") if isinstance(v, str) else v
-            else:
-                headers[k] = v.encode("utf-8") if isinstance(v, unicode) else v
-
-        if 'Content-Length' in http_request.headers:
-            # This is most annoying bug in treq
-            # It will add it's own Content-Length Header
-            headers = dict(headers)
-            del headers['Content-Length']
-
-        if six.PY3 and isinstance(http_request.body, str):
-            data = http_request.body.encode('utf-8')
-        else:
-            data = http_request.body
+        # Content-Length is dropped here: this is most annoying bug in treq,
+        # it will add it's own Content-Length Header
+        headers = {k: v.encode('utf-8') if isinstance(v, _TEXT_TYPE) else v
+                   for k, v in http_request.headers.items()
+                   if k != 'Content-Length'}
+
+        data = http_request.body
+        if isinstance(data, _TEXT_TYPE):
+            data = data.encode('utf-8')
 
         return self.client.request(method=http_request.method,
                                    url=http_request.url,
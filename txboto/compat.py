@@ -34,10 +34,42 @@ import os
 
 # This allows txboto modules to say "from txboto.compat import json".  This is
 # preferred so that all modules don't have to repeat this idiom.
+import json
+
+# json_dumps/json_loads are for plain payloads (no object_hook, cls, ...) and
+# use the fastest encoder available, falling back to the json module.
+# json_loads takes bytes or text, json_dumps_bytes returns the UTF-8 encoded
+# document, ready to be sent.
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+    json_dumps_bytes = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        json_dumps = ujson.dumps
+        json_loads = ujson.loads
+    except ImportError:
+        json_dumps = json.dumps
+
+        def json_loads(s):
+            # json.loads only accepts bytes from Python 3.6 on.
+            if str is not bytes and isinstance(s, bytes):
+                s = s.decode('utf-8')
+            return json.loads(s)
+
+    def json_dumps_bytes(obj):
+        return json_dumps(obj).encode('utf-8')
+
+# simdjson is only worth its overhead on large documents, callers decide
+# when to use it.
 try:
-    import simplejson as json
+    import simdjson
 except ImportError:
-    import json
+    simdjson = None
 
 
 # Switch to use encodebytes, which deprecates encodestring in Python 3
@@ -68,6 +100,12 @@ from six.moves.urllib.parse import (parse_qs, quote, unquote,
                                     urlencode)
 from six.moves.urllib.request import urlopen
 
+try:
+    from urllib.parse import quote_from_bytes
+except ImportError:
+    # Python 2's quote already works on byte strings.
+    quote_from_bytes = quote
+
 if six.PY3:
     # StandardError was removed, so use the base exception type instead
     StandardError = Exception
@@ -51,18 +51,22 @@ Handles connections to AWS
 """
 from __future__ import absolute_import
 
+import logging
 import os
 import random
 import re
 import sys
 import time
-import xml.sax
 
-from twisted.internet import defer
+from collections import OrderedDict
+from zlib import crc32
+
+from twisted.internet import defer, task
 
 from datetime import datetime
 
 import txboto
+import txboto.handler
 
 from txboto import auth
 from txboto import config
@@ -75,11 +79,84 @@ from txboto.httpcodes import code2status
 from txboto.provider import Provider
 from txboto.resultset import ResultSet
 
+MULTIPLE_SLASHES_RE = re.compile(r'/{2,}')
+LEADING_SLASH_RE = re.compile(r'^(/*)/')
+
+# Server errors that _mexe retries after a backoff.
+RETRYABLE_STATUS_CODES = frozenset((500, 502, 503, 504))
+
+# six type tuples, bound once for the isinstance checks below.
+_STRING_TYPES = six.string_types
+_INTEGER_TYPES = six.integer_types
+_STRING_BODY_TYPES = (bytes, six.text_type)
+
+# Headers added by the auth handlers when a request is signed.
+_SIGNING_HEADERS = ('Authorization', 'X-Amzn-Authorization', 'X-Amz-Date')
+
 ON_APP_ENGINE = all(key in os.environ for key in (
     'USER_IS_ADMIN', 'CURRENT_VERSION_ID', 'APPLICATION_ID'))
 
+# This unfortunate little hack can be attributed to a difference in the 2.6
+# version of http_client.  In old versions, it would append ":443" to the
+# hostname sent in the Host header and so we needed to make sure we did the
+# same when calculating the V2 signature.  In 2.6 (and higher!) it no longer
+# does that.  Hence, this kludge.
+OMIT_HTTPS_PORT = ((ON_APP_ENGINE and sys.version[:3] == '2.5') or
+                   sys.version[:3] in ('2.6', '2.7'))
+
+# Request bodies longer than this are cut short in debug logs.
+MAX_LOGGED_BODY = 1024
+
+
+def _request_state(request):
+    """
+    Returns what a signature covers of ``request``, to tell whether it was
+    changed since it was signed.
+    """
+    return (request.method, request.host, request.path, request.body,
+            dict(request.headers), dict(request.params or {}))
+
+
+def _loggable_body(body):
+    if isinstance(body, _STRING_BODY_TYPES) and len(body) > MAX_LOGGED_BODY:
+        return '%r... (%d bytes)' % (body[:MAX_LOGGED_BODY], len(body))
+    return body
+
+
+def _read_body_crc32(response):
+    """
+    Read the body of ``response``, computing its CRC32 as the chunks
+    arrive.  Returns a Deferred firing with ``(body, crc32)``.
+    """
+    chunks = []
+    checksum = [0]
+
+    def collect(chunk):
+        chunks.append(chunk)
+        checksum[0] = crc32(chunk, checksum[0])
+
+    d = response.collect(collect)
+    d.addCallback(lambda _: (b''.join(chunks), checksum[0] & 0xffffffff))
+    return d
+
 
 class AWSAuthConnection(AWSBaseConnection):
+
+    ChecksumResponseBody = False
+    """Whether _mexe computes the CRC32 of response bodies while reading
+    them.  The result is stored as ``response.body_crc32``."""
+
+    SignedRequestCacheSize = 0
+    """How many signed requests are kept for reuse; 0 (the default) disables
+    the cache.  Only requests signed with headers are cached."""
+
+    SignedRequestTTL = 120
+    """Seconds a signed request may be reused, well within the 5 minutes
+    SigV4 allows between ``X-Amz-Date`` and the time a request arrives."""
+
+    SignedRequestMaxBody = 4096
+    """Requests with a larger body are never cached."""
+
     def __init__(self, host, aws_access_key_id=None,
                  aws_secret_access_key=None,
                  is_secure=True, port=None, proxy=None, proxy_port=None,
@@ -154,11 +231,12 @@ class AWSAuthConnection(AWSBaseConnection):
 
         self.suppress_consec_slashes = suppress_consec_slashes
         self.num_retries = 6
+        self.max_retry_delay = config.getfloat('TxBoto', 'max_retry_delay', 60)
 
         self.path = path
 
         # if the value passed in for debug
-        if not isinstance(debug, six.integer_types):
+        if not isinstance(debug, _INTEGER_TYPES):
             debug = 0
         self.debug = config.getint('TxBoto', 'debug', debug)
 
@@ -168,32 +246,57 @@ class AWSAuthConnection(AWSBaseConnection):
             # http://docs.aws.amazon.com/amazonswf/latest/apireference/API_PollForActivityTask.html
             self.timeout = config.getint('TxBoto', 'http_socket_timeout', 70)
 
+        # The provider and the auth handler are only built when first used;
+        # building the provider may read credential files or even query the
+        # instance metadata server.
+        self._provider = None
+        self._auth_handler_instance = None
+        self._auth_host = host
         if isinstance(provider, Provider):
             # Allow overriding Provider
-            self.provider = provider
+            self._provider = provider
+            overrides = (provider.host, provider.port, provider.host_header)
         else:
             self._provider_type = provider
-            self.provider = Provider(self._provider_type,
-                                     aws_access_key_id,
-                                     aws_secret_access_key,
-                                     security_token,
-                                     profile_name)
+            self._provider_args = (aws_access_key_id, aws_secret_access_key,
+                                   security_token, profile_name)
+            overrides = Provider.get_endpoint_overrides(provider)
 
         # Allow config file to override default host, port, and host header.
-        if self.provider.host:
-            self.host = self.provider.host
-        if self.provider.port:
-            self.port = self.provider.port
-        if self.provider.host_header:
-            self.host_header = self.provider.host_header
+        override_host, override_port, override_host_header = overrides
+        if override_host:
+            self.host = override_host
+        if override_port:
+            self.port = override_port
+        if override_host_header:
+            self.host_header = override_host_header
 
         self._last_rs = None
-        self._auth_handler = auth.get_auth_handler(
-            host, config, self.provider, self._required_auth_capability())
-        if getattr(self, 'AuthServiceName', None) is not None:
-            self.auth_service_name = self.AuthServiceName
+        self._signed_requests = OrderedDict()
         self.request_hook = None
 
+    def _get_provider(self):
+        if self._provider is None:
+            self._provider = Provider(self._provider_type, *self._provider_args)
+        return self._provider
+
+    def _set_provider(self, value):
+        self._provider = value
+    provider = property(_get_provider, _set_provider)
+
+    def _get_auth_handler(self):
+        if self._auth_handler_instance is None:
+            self._auth_handler_instance = auth.get_auth_handler(
+                self._auth_host, config, self.provider,
+                self._required_auth_capability())
+            if getattr(self, 'AuthServiceName', None) is not None:
+                self._auth_handler_instance.service_name = self.AuthServiceName
+        return self._auth_handler_instance
+
+    def _set_auth_handler(self, value):
+        self._auth_handler_instance = value
+    _auth_handler = property(_get_auth_handler, _set_auth_handler)
+
     def __repr__(self):
         return '%s:%s' % (self.__class__.__name__, self.host)
 
@@ -239,23 +342,17 @@ class AWSAuthConnection(AWSBaseConnection):
         # https://groups.google.com/forum/#!topic/boto-dev/-ft0XPUy0y8
         # You can override that behavior with the suppress_consec_slashes param.
         if not self.suppress_consec_slashes:
-            return self.path + re.sub('^(/*)/', "\\1", path)
+            return self.path + LEADING_SLASH_RE.sub(r'\1', path)
         pos = path.find('?')
         if pos >= 0:
             params = path[pos:]
             path = path[:pos]
         else:
             params = None
-        if path[-1] == '/':
-            need_trailing = True
-        else:
-            need_trailing = False
-        path_elements = self.path.split('/')
-        path_elements.extend(path.split('/'))
-        path_elements = [p for p in path_elements if p]
-        path = '/' + '/'.join(path_elements)
-        if path[-1] != '/' and need_trailing:
-            path += '/'
+        need_trailing = path.endswith('/')
+        path = MULTIPLE_SLASHES_RE.sub('/', '/%s/%s' % (self.path, path))
+        if not need_trailing and len(path) > 1:
+            path = path.rstrip('/')
         if params:
             path = path + params
         return path
@@ -263,22 +360,9 @@ class AWSAuthConnection(AWSBaseConnection):
     def server_name(self, port=None):
         if not port:
             port = self.port
-        if port == 80:
-            signature_host = self.host
-        else:
-            # This unfortunate little hack can be attributed to
-            # a difference in the 2.6 version of http_client.  In old
-            # versions, it would append ":443" to the hostname sent
-            # in the Host header and so we needed to make sure we
-            # did the same when calculating the V2 signature.  In 2.6
-            # (and higher!)
-            # it no longer does that.  Hence, this kludge.
-            if ((ON_APP_ENGINE and sys.version[:3] == '2.5') or
-                    sys.version[:3] in ('2.6', '2.7')) and port == 443:
-                signature_host = self.host
-            else:
-                signature_host = '%s:%d' % (self.host, port)
-        return signature_host
+        if port == 80 or (OMIT_HTTPS_PORT and port == 443):
+            return self.host
+        return '%s:%d' % (self.host, port)
 
     def set_host_header(self, request):
         try:
@@ -296,14 +380,10 @@ class AWSAuthConnection(AWSBaseConnection):
         path = self.get_path(path)
         if auth_path is not None:
             auth_path = self.get_path(auth_path)
-        if params is None:
-            params = {}
-        else:
-            params = params.copy()
-        if headers is None:
-            headers = {}
-        else:
-            headers = headers.copy()
+        # Copies protect the caller's dicts from the auth handlers; empty
+        # ones are simply replaced.
+        params = params.copy() if params else {}
+        headers = headers.copy() if headers else {}
         if self.host_header and not txboto.utils.find_matching_headers('host',
                                                                        headers):
             headers['host'] = self.host_header
@@ -318,14 +398,10 @@ class AWSAuthConnection(AWSBaseConnection):
         path = self.get_path(path)
         if auth_path is not None:
             auth_path = self.get_path(auth_path)
-        if params is None:
-            params = {}
-        else:
-            params = params.copy()
-        if headers is None:
-            headers = {}
-        else:
-            headers = headers.copy()
+        # Copies protect the caller's dicts from the auth handlers; empty
+        # ones are simply replaced.
+        params = params.copy() if params else {}
+        headers = headers.copy() if headers else {}
         if self.host_header and not txboto.utils.find_matching_headers('host',
                                                                        headers):
             headers['host'] = self.host_header
@@ -334,6 +410,52 @@ class AWSAuthConnection(AWSBaseConnection):
         return HTTPRequest(method, self.protocol, host, self.port,
                            path, auth_path, params, headers, body)
 
+    def _authorize(self, request):
+        """
+        Sign ``request``.  Polling clients often send the very same request
+        over and over, so with ``SignedRequestCacheSize`` set, the signed
+        headers, path and body of recent requests are kept and reused for
+        identical ones instead of signing them again.
+
+        Returns the time the headers were signed at, which is earlier than
+        now when they come from the cache.
+        """
+        body = request.body
+        headers = request.headers
+        # Requests being re-signed already carry signing headers, which
+        # would make their key unique and never hit.
+        if not self.SignedRequestCacheSize or \
+                not isinstance(body, _STRING_BODY_TYPES) or \
+                len(body) > self.SignedRequestMaxBody or \
+                not getattr(self._auth_handler, 'SignsInHeaders', False) or \
+                any(h in headers for h in _SIGNING_HEADERS):
+            request.authorize(connection=self)
+            return time.time()
+        provider = self.provider
+        try:
+            key = (request.method, request.host, request.path,
+                   request.auth_path, body,
+                   frozenset(request.params.items()),
+                   frozenset(headers.items()),
+                   provider.access_key, provider.security_token)
+            cached = self._signed_requests.get(key)
+        except TypeError:
+            # Unhashable param or header values.
+            request.authorize(connection=self)
+            return time.time()
+        now = time.time()
+        if cached is not None and now - cached[0] < self.SignedRequestTTL:
+            request.headers = dict(cached[1])
+            request.path = cached[2]
+            request.body = cached[3]
+            return cached[0]
+        request.authorize(connection=self)
+        self._signed_requests[key] = (now, dict(request.headers),
+                                      request.path, request.body)
+        if len(self._signed_requests) > self.SignedRequestCacheSize:
+            self._signed_requests.popitem(last=False)
+        return now
+
     @defer.inlineCallbacks
     def _mexe(self, request, override_num_retries=1,
               retry_handler=None):
@@ -346,10 +468,12 @@ class AWSAuthConnection(AWSBaseConnection):
         Google group by Larry Bates.  Thanks!
 
         """
-        log.debug('Method: %s' % request.method)
-        log.debug('Url: %s' % request.url)
-        log.debug('Data: %s' % request.body)
-        log.debug('Headers: %s' % request.headers)
+        from twisted.internet import reactor
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Method: %s', request.method)
+            log.debug('Url: %s', request.url)
+            log.debug('Data: %s', _loggable_body(request.body))
+            log.debug('Headers: %s', request.headers)
         returnValue = None
         response = None
         body = None
@@ -358,20 +482,41 @@ class AWSAuthConnection(AWSBaseConnection):
             num_retries = config.getint('TxBoto', 'num_retries', self.num_retries)
         else:
             num_retries = override_num_retries
+        max_retry_delay = self.max_retry_delay
+        rand = random.random
+        signed_at = signed_with = signed_state = None
+        reuse_signature = getattr(self._auth_handler, 'SignsInHeaders', False)
         i = 0
         while i <= num_retries:
             # Use binary exponential backoff to desynchronize client requests.
-            next_sleep = min(random.random() * (2 ** i),
-                             config.get('TxBoto', 'max_retry_delay', 60))
+            next_sleep = min(rand() * (1 << i), max_retry_delay)
             try:
-                request.authorize(connection=self)
-                log.debug('Final headers: %s' % request.headers)
-                request.start_time = datetime.now()
+                # Retries keep the first attempt's header signature while it
+                # is still fresh, the credentials have not been renewed and
+                # nothing (e.g. a retry handler) changed the request meanwhile.
+                provider = self.provider
+                credentials = (provider.access_key, provider.security_token)
+                if not reuse_signature or signed_at is None or \
+                        credentials != signed_with or \
+                        time.time() - signed_at > self.SignedRequestTTL or \
+                        _request_state(request) != signed_state:
+                    signed_at = self._authorize(request)
+                    signed_with = credentials
+                    if reuse_signature:
+                        signed_state = _request_state(request)
+                log.debug('Final headers: %s', request.headers)
+                if self.request_hook is not None:
+                    # Only request hooks read start_time, as a datetime.
+                    request.start_time = datetime.now()
 
                 response = yield self.send_request(request)
-                response_body = yield response.content()
+                if self.ChecksumResponseBody:
+                    response_body, response.body_crc32 = \
+                        yield _read_body_crc32(response)
+                else:
+                    response_body = yield response.content()
                 response.reason = code2status(response.code, 'N/A')
-                log.debug('Response headers: %s' % response.headers)
+                log.debug('Response headers: %s', response.headers)
                 location = response.headers.getRawHeaders('location')
                 if location:
                     location = location[0]
@@ -383,12 +528,11 @@ class AWSAuthConnection(AWSBaseConnection):
                         msg, i, next_sleep = status
                         if msg:
                             log.debug(msg)
-                        time.sleep(next_sleep)
+                        yield task.deferLater(reactor, next_sleep, lambda: None)
                         continue
-                if response.code in [500, 502, 503, 504]:
-                    msg = 'Received %d response.  ' % response.code
-                    msg += 'Retrying in %3.1f seconds' % next_sleep
-                    log.debug(msg)
+                if response.code in RETRYABLE_STATUS_CODES:
+                    log.debug('Received %d response.  Retrying in %3.1f seconds',
+                              response.code, next_sleep)
                     body = response_body
                     if isinstance(body, bytes):
                         body = body.decode('utf-8')
@@ -406,18 +550,18 @@ class AWSAuthConnection(AWSBaseConnection):
                     returnValue = (response, response_body,)
                     break
             except PleaseRetryException as e:
-                log.debug('encountered a retry exception: {}'.foramt(e))
+                log.debug('encountered a retry exception: %s', e)
                 response = e.response
                 ex = e
             except self.http_exceptions as e:
                 if isinstance(e, self.http_unretryable_exceptions):
-                    log.debug('encountered unretryable {} exception, re-raising'
-                              .format(e.__class__.__name__))
+                    log.debug('encountered unretryable %s exception, re-raising',
+                              e.__class__.__name__)
                     raise
-                log.debug('encountered {} exception, reconnecting'
-                          .format(e.__class__.__name__))
+                log.debug('encountered %s exception, reconnecting',
+                          e.__class__.__name__)
                 ex = e
-            time.sleep(next_sleep)
+            yield task.deferLater(reactor, next_sleep, lambda: None)
             i += 1
 
         if isinstance(returnValue, tuple):
@@ -448,9 +592,6 @@ class AWSAuthConnection(AWSBaseConnection):
         return self._mexe(http_request, sender, override_num_retries,
                           retry_handler=retry_handler)
 
-    def close(self):
-        pass
-
 
 class AWSQueryConnection(AWSAuthConnection):
 
@@ -492,10 +633,10 @@ class AWSQueryConnection(AWSAuthConnection):
         return self._mexe(http_request)
 
     def build_list_params(self, params, items, label):
-        if isinstance(items, six.string_types):
+        if isinstance(items, _STRING_TYPES):
             items = [items]
-        for i in range(1, len(items) + 1):
-            params['%s.%d' % (label, i)] = items[i - 1]
+        params.update(('%s.%d' % (label, i), item)
+                      for i, item in enumerate(items, 1))
 
     def build_complex_list_params(self, params, items, label, names):
         """Serialize a list of structures.
@@ -531,73 +672,47 @@ class AWSQueryConnection(AWSAuthConnection):
         :param names: The names associated with each tuple element.
 
         """
-        for i, item in enumerate(items, 1):
-            current_prefix = '%s.%s' % (label, i)
-            for key, value in zip(names, item):
-                full_key = '%s.%s' % (current_prefix, key)
-                params[full_key] = value
+        params.update(('%s.%d.%s' % (label, i, key), value)
+                      for i, item in enumerate(items, 1)
+                      for key, value in zip(names, item))
 
     # generics
 
-    def get_list(self, action, params, markers, path='/',
-                 parent=None, verb='GET'):
+    @defer.inlineCallbacks
+    def _get_xml_response(self, action, params, path, verb, parent,
+                          target_factory):
+        """
+        Make a request and parse its XML response into the object returned
+        by ``target_factory(parent)``, which is what the Deferred fires with.
+        """
         if not parent:
             parent = self
-        response = self.make_request(action, params, path, verb)
-        body = response.read()
-        txboto.log.debug(body)
+        response, body = yield self.make_request(action, params, path, verb)
+        log = txboto.log
+        log.debug(body)
         if not body:
-            txboto.log.error('Null body %s' % body)
-            raise self.ResponseError(response.status, response.reason, body)
-        elif response.status == 200:
-            rs = ResultSet(markers)
-            h = txboto.handler.XmlHandler(rs, parent)
-            if isinstance(body, six.text_type):
-                body = body.encode('utf-8')
-            xml.sax.parseString(body, h)
-            return rs
+            log.error('Null body %s', body)
+            raise self.ResponseError(response.code, response.reason, body)
+        elif response.code == 200:
+            target = target_factory(parent)
+            h = txboto.handler.XmlHandler(target, parent)
+            txboto.handler.parse_string(body, h)
+            defer.returnValue(target)
         else:
-            txboto.log.error('%s %s' % (response.status, response.reason))
-            txboto.log.error('%s' % body)
-            raise self.ResponseError(response.status, response.reason, body)
+            log.error('%s %s', response.code, response.reason)
+            log.error('%s', body)
+            raise self.ResponseError(response.code, response.reason, body)
+
+    def get_list(self, action, params, markers, path='/',
+                 parent=None, verb='GET'):
+        return self._get_xml_response(action, params, path, verb, parent,
+                                      lambda parent: ResultSet(markers))
 
     def get_object(self, action, params, cls, path='/',
                    parent=None, verb='GET'):
-        if not parent:
-            parent = self
-        response = self.make_request(action, params, path, verb)
-        body = response.read()
-        txboto.log.debug(body)
-        if not body:
-            txboto.log.error('Null body %s' % body)
-            raise self.ResponseError(response.status, response.reason, body)
-        elif response.status == 200:
-            obj = cls(parent)
-            h = txboto.handler.XmlHandler(obj, parent)
-            if isinstance(body, six.text_type):
-                body = body.encode('utf-8')
-            xml.sax.parseString(body, h)
-            return obj
-        else:
-            txboto.log.error('%s %s' % (response.status, response.reason))
-            txboto.log.error('%s' % body)
-            raise self.ResponseError(response.status, response.reason, body)
+        return self._get_xml_response(action, params, path, verb, parent, cls)
 
     def get_status(self, action, params, path='/', parent=None, verb='GET'):
-        if not parent:
-            parent = self
-        response = self.make_request(action, params, path, verb)
-        body = response.read()
-        txboto.log.debug(body)
-        if not body:
-            txboto.log.error('Null body %s' % body)
-            raise self.ResponseError(response.status, response.reason, body)
-        elif response.status == 200:
-            rs = ResultSet()
-            h = txboto.handler.XmlHandler(rs, parent)
-            xml.sax.parseString(body, h)
-            return rs.status
-        else:
-            txboto.log.error('%s %s' % (response.status, response.reason))
-            txboto.log.error('%s' % body)
-            raise self.ResponseError(response.status, response.reason, body)
+        d = self._get_xml_response(action, params, path, verb, parent,
+                                   lambda parent: ResultSet())
+        return d.addCallback(lambda rs: rs.status)
@@ -31,7 +31,7 @@
 
 #
 
-from txboto.regioninfo import RegionInfo, get_regions
+from txboto.regioninfo import RegionInfo, get_region as _get_region, get_regions
 
 
 def regions():
@@ -45,8 +45,20 @@ def regions():
     return get_regions('dynamodb', connection_cls=txboto.dynamodb.layer2.Layer2)
 
 
+def get_region(region_name):
+    """
+    Look up a region by name.
+
+    :rtype: :class:`txboto.regioninfo.RegionInfo`
+    :return: The region, or ``None`` if there is no such region.
+    """
+    import txboto.dynamodb.layer2
+    return _get_region('dynamodb', region_name,
+                       connection_cls=txboto.dynamodb.layer2.Layer2)
+
+
 def connect_to_region(region_name, **kw_params):
-    for region in regions():
-        if region.name == region_name:
-            return region.connect(**kw_params)
+    region = get_region(region_name)
+    if region is not None:
+        return region.connect(**kw_params)
     return None
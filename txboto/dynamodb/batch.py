@@ -30,9 +30,87 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-import six
+import random
 
-from twisted.internet import defer
+from twisted.internet import defer, task
+
+from txboto.dynamodb.exceptions import DynamoDBThroughputExceededError
+
+
+def _backoff(attempt, base_delay, max_delay):
+    """
+    Return a Deferred firing after an exponentially growing, jittered
+    delay for the given (zero based) retry attempt.
+    """
+    from twisted.internet import reactor
+    delay = min(max_delay, base_delay * (1 << attempt))
+    return task.deferLater(reactor, delay * random.uniform(0.5, 1.5),
+                           lambda: None)
+
+
+def _chunk_ops(table_ops, max_batch_size):
+    """
+    Split ``(table_name, op_list)`` pairs into a list of RequestItems
+    dicts holding at most ``max_batch_size`` operations each.
+    """
+    chunks = []
+    chunk = {}
+    size = 0
+    for table_name, op_list in table_ops:
+        for op in op_list:
+            if size == max_batch_size:
+                chunks.append(chunk)
+                chunk = {}
+                size = 0
+            chunk.setdefault(table_name, []).append(op)
+            size += 1
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _merge_results(merged, result, unprocessed_key):
+    """
+    Merge the per-table ``Responses`` and the unprocessed requests
+    of a batch ``result`` into ``merged``.
+    """
+    for table_name, response in result.get('Responses', {}).items():
+        table_response = merged.setdefault(
+            'Responses', {}).setdefault(table_name, {})
+        for name, value in response.items():
+            if isinstance(value, list):
+                table_response.setdefault(name, []).extend(value)
+            else:
+                table_response[name] = table_response.get(name, 0) + value
+    for table_name, pending in result.get(unprocessed_key, {}).items():
+        tables = merged.setdefault(unprocessed_key, {})
+        if table_name not in tables:
+            tables[table_name] = pending
+        elif isinstance(pending, list):
+            tables[table_name].extend(pending)
+        else:
+            tables[table_name]['Keys'].extend(pending['Keys'])
+
+
+@defer.inlineCallbacks
+def _submit_all(submit, requests, unprocessed_key):
+    """
+    Send each RequestItems dict in ``requests`` through ``submit``
+    concurrently and merge the results.  The first failure, if any,
+    is re-raised once all requests are done.
+    """
+    if len(requests) == 1:
+        result = yield submit(requests[0])
+        defer.returnValue(result)
+
+    results = yield defer.DeferredList([submit(r) for r in requests],
+                                       consumeErrors=True)
+    merged = {}
+    for success, result in results:
+        if not success:
+            result.raiseException()
+        _merge_results(merged, result, unprocessed_key)
+    defer.returnValue(merged)
 
 
 class Batch(object):
@@ -60,6 +138,8 @@ class Batch(object):
 
     """
 
+    __slots__ = ('table', 'keys', 'attributes_to_get', 'consistent_read')
+
     def __init__(self, table, keys, attributes_to_get=None,
                  consistent_read=False):
         self.table = table
@@ -72,17 +152,8 @@ class Batch(object):
         Convert the Batch object into the format required for Layer1.
         """
         batch_dict = {}
-        key_list = []
-        for key in self.keys:
-            if isinstance(key, tuple):
-                hash_key, range_key = key
-            else:
-                hash_key = key
-                range_key = None
-            k = self.table.layer2.build_key_from_values(self.table.schema,
-                                                        hash_key, range_key)
-            key_list.append(k)
-        batch_dict['Keys'] = key_list
+        batch_dict['Keys'] = self.table.layer2.build_keys_from_values(
+            self.table.schema, self.keys)
         if self.attributes_to_get:
             batch_dict['AttributesToGet'] = self.attributes_to_get
         if self.consistent_read:
@@ -112,6 +183,8 @@ class BatchWrite(object):
         for the table schema.
     """
 
+    __slots__ = ('table', 'puts', 'deletes')
+
     def __init__(self, table, puts=None, deletes=None):
         self.table = table
         self.puts = puts or []
@@ -121,21 +194,12 @@ class BatchWrite(object):
         """
         Convert the Batch object into the format required for Layer1.
         """
-        op_list = []
-        for item in self.puts:
-            d = {'Item': self.table.layer2.dynamize_item(item)}
-            d = {'PutRequest': d}
-            op_list.append(d)
-        for key in self.deletes:
-            if isinstance(key, tuple):
-                hash_key, range_key = key
-            else:
-                hash_key = key
-                range_key = None
-            k = self.table.layer2.build_key_from_values(self.table.schema,
-                                                        hash_key, range_key)
-            d = {'Key': k}
-            op_list.append({'DeleteRequest': d})
+        layer2 = self.table.layer2
+        dynamize_item = layer2.dynamize_item
+        op_list = [{'PutRequest': {'Item': dynamize_item(item)}}
+                   for item in self.puts]
+        keys = layer2.build_keys_from_values(self.table.schema, self.deletes)
+        op_list.extend({'DeleteRequest': {'Key': k}} for k in keys)
         return (self.table.name, op_list)
 
 
@@ -145,6 +209,15 @@ class BatchList(list):
     :class:`txboto.dynamodb.batch.Batch` objects.
     """
 
+    MaxRetries = 5
+    """Number of times unprocessed keys are retried by ``submit``."""
+
+    RetryBaseDelay = 0.05
+    """Delay in seconds before the first retry of unprocessed keys."""
+
+    MaxRetryDelay = 5
+    """Upper bound in seconds of the delay between two retries."""
+
     def __init__(self, layer2):
         list.__init__(self)
         self.unprocessed = None
@@ -185,14 +258,27 @@ class BatchList(list):
 
         Note: This method is experimental and subject to changes in future releases
         """
+        tables = dict((batch.table.name, batch.table) for batch in self)
         del self[:]
 
         if not self.unprocessed:
             return None
 
-        for table_name, table_req in six.iteritems(self.unprocessed):
+        # Tables of the previous submit are reused; any other table is
+        # described concurrently rather than one round-trip at a time.
+        missing = [name for name in self.unprocessed if name not in tables]
+        if missing:
+            results = yield defer.DeferredList(
+                [self.layer2.get_table(name) for name in missing],
+                consumeErrors=True)
+            for name, (success, table) in zip(missing, results):
+                if not success:
+                    table.raiseException()
+                tables[name] = table
+
+        for table_name, table_req in self.unprocessed.items():
             table_keys = table_req['Keys']
-            table = yield self.layer2.get_table(table_name)
+            table = tables[table_name]
 
             keys = []
             for key in table_keys:
@@ -213,11 +299,46 @@ class BatchList(list):
 
     @defer.inlineCallbacks
     def submit(self):
-        result = yield self.layer2.batch_get_item(self)
-        if 'UnprocessedKeys' in result:
-            self.unprocessed = result['UnprocessedKeys']
+        """
+        Submit the batch.  One BatchGetItem request is sent per table
+        and the requests run concurrently.  Keys left unprocessed by
+        DynamoDB are retried with exponential backoff up to
+        ``MaxRetries`` times and the responses are merged; whatever
+        is still unprocessed afterwards is kept in ``unprocessed`` for
+        ``resubmit``.
+        """
+        result = yield self._submit_tables(self.to_dict())
+        attempt = 0
+        while result.get('UnprocessedKeys') and attempt < self.MaxRetries:
+            yield _backoff(attempt, self.RetryBaseDelay, self.MaxRetryDelay)
+            attempt += 1
+            self.unprocessed = result.pop('UnprocessedKeys')
+            retry = yield self._submit_tables(self._dynamize_unprocessed())
+            _merge_results(result, retry, 'UnprocessedKeys')
+        self.unprocessed = result.get('UnprocessedKeys')
         defer.returnValue(result)
 
+    def _submit_tables(self, request_items):
+        requests = [{table_name: table_req}
+                    for table_name, table_req in request_items.items()]
+        return _submit_all(self.layer2.batch_get_item,
+                           requests or [request_items], 'UnprocessedKeys')
+
+    def _dynamize_unprocessed(self):
+        """
+        Convert the (decoded) unprocessed keys back into the RequestItems
+        format required by Layer1.
+        """
+        encode = self.layer2.dynamizer.encode
+        d = {}
+        for table_name, table_req in self.unprocessed.items():
+            req = dict(table_req)
+            req['Keys'] = [dict((name, encode(value))
+                                for name, value in key.items())
+                           for key in table_req['Keys']]
+            d[table_name] = req
+        return d
+
     def to_dict(self):
         """
         Convert a BatchList object into format required for Layer1.
@@ -236,6 +357,15 @@ class BatchWriteList(list):
     :class:`txboto.dynamodb.batch.BatchWrite` objects.
     """
 
+    MaxRetries = 5
+    """Number of times unprocessed items are retried by ``submit``."""
+
+    RetryBaseDelay = 0.05
+    """Delay in seconds before the first retry of unprocessed items."""
+
+    MaxRetryDelay = 5
+    """Upper bound in seconds of the delay between two retries."""
+
     def __init__(self, layer2):
         list.__init__(self)
         self.layer2 = layer2
@@ -263,10 +393,62 @@ class BatchWriteList(list):
         self.append(BatchWrite(table, puts, deletes))
 
     @defer.inlineCallbacks
-    def submit(self):
-        result = yield self.layer2.batch_write_item(self)
+    def submit(self, max_batch_size=25):
+        """
+        Submit the puts and deletes of this BatchWriteList.
+
+        DynamoDB accepts at most 25 write requests per BatchWriteItem
+        call, so the requests are split into chunks of at most
+        ``max_batch_size`` operations which are sent concurrently.
+        Items left unprocessed are retried with exponential backoff
+        up to ``MaxRetries`` times.  The per-table ``Responses`` and
+        the remaining ``UnprocessedItems`` are merged into a single
+        result.
+        """
+        result = yield self._submit_chunks(
+            self.to_chunks(max_batch_size) or [self.to_dict()])
+        attempt = 0
+        while result.get('UnprocessedItems') and attempt < self.MaxRetries:
+            yield _backoff(attempt, self.RetryBaseDelay, self.MaxRetryDelay)
+            attempt += 1
+            unprocessed = self._dynamize_unprocessed(
+                result.pop('UnprocessedItems'))
+            retry = yield self._submit_chunks(
+                _chunk_ops(unprocessed.items(), max_batch_size))
+            _merge_results(result, retry, 'UnprocessedItems')
         defer.returnValue(result)
 
+    def _submit_chunks(self, chunks):
+        return _submit_all(self.layer2.batch_write_item, chunks,
+                           'UnprocessedItems')
+
+    def _dynamize_unprocessed(self, unprocessed):
+        """
+        Convert (decoded) unprocessed items back into the RequestItems
+        format required by Layer1.
+        """
+        encode = self.layer2.dynamizer.encode
+        d = {}
+        for table_name, ops in unprocessed.items():
+            op_list = d[table_name] = []
+            for op in ops:
+                if 'PutRequest' in op:
+                    item = self.layer2.dynamize_item(op['PutRequest']['Item'])
+                    op_list.append({'PutRequest': {'Item': item}})
+                else:
+                    key = op['DeleteRequest']['Key']
+                    key = dict((name, encode(value))
+                               for name, value in key.items())
+                    op_list.append({'DeleteRequest': {'Key': key}})
+        return d
+
+    def to_chunks(self, max_batch_size=25):
+        """
+        Split this BatchWriteList into a list of RequestItems dicts,
+        each holding at most ``max_batch_size`` write requests.
+        """
+        return _chunk_ops((batch.to_dict() for batch in self), max_batch_size)
+
     def to_dict(self):
         """
         Convert a BatchWriteList object into format required for Layer1.
@@ -276,3 +458,150 @@ class BatchWriteList(list):
             table_name, batch_dict = batch.to_dict()
             d[table_name] = batch_dict
         return d
+
+
+def _unprocessed_keys(unprocessed, tables):
+    """
+    Return the ``(table_name, hash_key, range_key)`` keys of the
+    decoded ``unprocessed`` write requests, using the schemas of the
+    tables in ``tables``.
+    """
+    keys = set()
+    for table_name, ops in (unprocessed or {}).items():
+        schema = tables[table_name][0].schema
+        for op in ops:
+            if 'PutRequest' in op:
+                item = op['PutRequest']['Item']
+                keys.add((table_name, item[schema.hash_key_name],
+                          item.get(schema.range_key_name)))
+            else:
+                key = op['DeleteRequest']['Key']
+                keys.add((table_name, key['HashKeyElement'],
+                          key.get('RangeKeyElement')))
+    return keys
+
+
+class AutoBatchWriter(object):
+    """
+    Queues single item puts and deletes and writes them with
+    BatchWriteItem requests.  The queue is flushed when it holds
+    ``max_items`` operations or ``max_wait`` seconds after the first
+    operation was queued, whichever comes first.
+
+    Each queued operation returns a Deferred which fires with its
+    share of the capacity consumed, like a single put or delete, or
+    fails with DynamoDBThroughputExceededError if it was still left
+    unprocessed once the batch retries ran out.
+    """
+
+    def __init__(self, layer2, max_items=25, max_wait=0.01):
+        self.layer2 = layer2
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self._pending = []
+        self._keys = set()
+        self._delayed_flush = None
+        self._barrier = None
+
+    def put(self, item):
+        """Queue the put of a :class:`txboto.dynamodb.item.Item`."""
+        return self._enqueue(item, True)
+
+    def delete(self, item):
+        """Queue the deletion of a :class:`txboto.dynamodb.item.Item`."""
+        return self._enqueue(item, False)
+
+    def _enqueue(self, item, is_put):
+        # A BatchWriteItem request may not touch the same key twice.
+        table = item.table
+        schema = table.schema
+        key = (table.name, item[schema.hash_key_name],
+               item.get(schema.range_key_name))
+        if key in self._keys:
+            self._barrier = self.flush()
+        d = defer.Deferred()
+        self._pending.append((item, is_put, key, d))
+        self._keys.add(key)
+        if len(self._pending) >= self.max_items:
+            self.flush()
+        elif self._delayed_flush is None:
+            from twisted.internet import reactor
+            self._delayed_flush = reactor.callLater(self.max_wait, self.flush)
+        return d
+
+    def flush(self):
+        """
+        Write all queued operations now.  Returns a Deferred firing
+        once they have been written.  It never fails: errors are
+        passed on to the Deferreds of the queued operations.
+        """
+        if self._delayed_flush is not None:
+            if self._delayed_flush.active():
+                self._delayed_flush.cancel()
+            self._delayed_flush = None
+        pending, self._pending = self._pending, []
+        self._keys = set()
+        barrier, self._barrier = self._barrier, None
+        if not pending:
+            return barrier or defer.succeed(None)
+
+        tables = {}
+
+        def submit(_):
+            for item, is_put, key, _ in pending:
+                table_name, hash_key, range_key = key
+                table, puts, deletes = tables.setdefault(
+                    table_name, (item.table, [], []))
+                if is_put:
+                    puts.append(item)
+                elif range_key is None:
+                    deletes.append(hash_key)
+                else:
+                    deletes.append((hash_key, range_key))
+            batch_list = self.layer2.new_batch_write_list()
+            for table, puts, deletes in tables.values():
+                batch_list.add_batch(table, puts=puts, deletes=deletes)
+            return batch_list.submit()
+
+        def fire(result):
+            unprocessed = _unprocessed_keys(result.get('UnprocessedItems'),
+                                            tables)
+            written = {}
+            for _, _, key, _ in pending:
+                if key not in unprocessed:
+                    written[key[0]] = written.get(key[0], 0) + 1
+            responses = result.get('Responses', {})
+            for item, is_put, key, d in pending:
+                if key in unprocessed:
+                    d.errback(DynamoDBThroughputExceededError(
+                        400, 'Bad Request', {
+                            '__type': 'ProvisionedThroughputExceededException',
+                            'message': 'Item left unprocessed by '
+                                       'BatchWriteItem'}))
+                    continue
+                # The capacity consumed for a table is shared evenly
+                # among the operations written to it.
+                item_result = {}
+                units = responses.get(key[0], {}).get('ConsumedCapacityUnits')
+                if units is not None:
+                    item_result['ConsumedCapacityUnits'] = \
+                        float(units) / written[key[0]]
+                    if is_put:
+                        item.consumed_units = \
+                            item_result['ConsumedCapacityUnits']
+                d.callback(item_result)
+
+        def fail(failure):
+            for _, _, _, d in pending:
+                if not d.called:
+                    d.errback(failure)
+
+        # Operations queued after a flush forced by a duplicate key are
+        # only written once that flush is done, so they land after it.
+        if barrier is None:
+            d = defer.maybeDeferred(submit, None)
+        else:
+            d = barrier.addCallback(submit)
+        d.addCallback(fire)
+        d.addErrback(fail)
+        return d
@@ -39,6 +39,11 @@ class Condition(object):
     is to test if something is a Condition instance or not.
     """
 
+    __slots__ = ()
+
+    _op = None
+    """The DynamoDB ComparisonOperator, set on each concrete condition."""
+
     def __eq__(self, other):
         if isinstance(other, Condition):
             return self.to_dict() == other.to_dict()
@@ -50,11 +55,13 @@ class ConditionNoArgs(Condition):
     as NULL or NOT_NULL.
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         return '%s' % self.__class__.__name__
 
     def to_dict(self):
-        return {'ComparisonOperator': self.__class__.__name__}
+        return {'ComparisonOperator': self._op}
 
 
 class ConditionOneArg(Condition):
@@ -63,6 +70,8 @@ class ConditionOneArg(Condition):
     such as EQ or NE.
     """
 
+    __slots__ = ('v1',)
+
     def __init__(self, v1):
         self.v1 = v1
 
@@ -71,7 +80,7 @@ class ConditionOneArg(Condition):
 
     def to_dict(self):
         return {'AttributeValueList': [dynamize_value(self.v1)],
-                'ComparisonOperator': self.__class__.__name__}
+                'ComparisonOperator': self._op}
 
 
 class ConditionTwoArgs(Condition):
@@ -80,6 +89,8 @@ class ConditionTwoArgs(Condition):
     The only example of this currently is BETWEEN.
     """
 
+    __slots__ = ('v1', 'v2')
+
     def __init__(self, v1, v2):
         self.v1 = v1
         self.v2 = v2
@@ -88,9 +99,9 @@ class ConditionTwoArgs(Condition):
         return '%s(%s, %s)' % (self.__class__.__name__, self.v1, self.v2)
 
     def to_dict(self):
-        values = (self.v1, self.v2)
-        return {'AttributeValueList': [dynamize_value(v) for v in values],
-                'ComparisonOperator': self.__class__.__name__}
+        return {'AttributeValueList': [dynamize_value(self.v1),
+                                       dynamize_value(self.v2)],
+                'ComparisonOperator': self._op}
 
 
 class ConditionSeveralArgs(Condition):
@@ -98,6 +109,8 @@ class ConditionSeveralArgs(Condition):
     Abstract class for conditions that require several argument (ex: IN).
     """
 
+    __slots__ = ('values',)
+
     def __init__(self, values):
         self.values = values
 
@@ -106,70 +119,83 @@ class ConditionSeveralArgs(Condition):
                                  ', '.join(self.values))
 
     def to_dict(self):
-        return {'AttributeValueList': [dynamize_value(v) for v in self.values],
-                'ComparisonOperator': self.__class__.__name__}
+        return {'AttributeValueList': list(map(dynamize_value, self.values)),
+                'ComparisonOperator': self._op}
 
 
 class EQ(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'EQ'
 
 
 class NE(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'NE'
 
 
 class LE(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'LE'
 
 
 class LT(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'LT'
 
 
 class GE(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'GE'
 
 
 class GT(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'GT'
 
 
 class NULL(ConditionNoArgs):
 
-    pass
+    __slots__ = ()
+    _op = 'NULL'
 
 
 class NOT_NULL(ConditionNoArgs):
 
-    pass
+    __slots__ = ()
+    _op = 'NOT_NULL'
 
 
 class CONTAINS(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'CONTAINS'
 
 
 class NOT_CONTAINS(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'NOT_CONTAINS'
 
 
 class BEGINS_WITH(ConditionOneArg):
 
-    pass
+    __slots__ = ()
+    _op = 'BEGINS_WITH'
 
 
 class IN(ConditionSeveralArgs):
 
-    pass
+    __slots__ = ()
+    _op = 'IN'
 
 
 class BETWEEN(ConditionTwoArgs):
 
-    pass
+    __slots__ = ()
+    _op = 'BETWEEN'
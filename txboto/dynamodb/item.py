@@ -31,6 +31,7 @@
 
 
 from txboto.dynamodb.exceptions import DynamoDBItemError
+from txboto.dynamodb.types import SCALAR_TYPES
 
 from twisted.internet import defer
 
@@ -47,41 +48,46 @@ class Item(dict):
     :ivar table: The Table this item belongs to.
     """
 
+    _dynamized_cache = None
+
     def __init__(self, table, hash_key=None, range_key=None, attrs=None):
         self.table = table
-        self._updates = None
-        self._hash_key_name = self.table.schema.hash_key_name
-        self._range_key_name = self.table.schema.range_key_name
+        self._dynamized_cache = None
+        self._dirty_keys = None
+        self._explicit_updates = {}
+        schema = table.schema
+        hash_key_name = schema.hash_key_name
+        range_key_name = schema.range_key_name
         if attrs is None:
             attrs = {}
         if hash_key is None:
-            hash_key = attrs.get(self._hash_key_name, None)
-        self[self._hash_key_name] = hash_key
-        if self._range_key_name:
+            hash_key = attrs.get(hash_key_name, None)
+        self[hash_key_name] = hash_key
+        if range_key_name:
             if range_key is None:
-                range_key = attrs.get(self._range_key_name, None)
-            self[self._range_key_name] = range_key
-        self._updates = {}
+                range_key = attrs.get(range_key_name, None)
+            self[range_key_name] = range_key
+        self._dirty_keys = set()
         for key, value in attrs.items():
-            if key != self._hash_key_name and key != self._range_key_name:
+            if key != hash_key_name and key != range_key_name:
                 self[key] = value
         self.consumed_units = 0
 
     @property
     def hash_key(self):
-        return self[self._hash_key_name]
+        return self[self.table.schema.hash_key_name]
 
     @property
     def range_key(self):
-        return self.get(self._range_key_name)
+        return self.get(self.table.schema.range_key_name)
 
     @property
     def hash_key_name(self):
-        return self._hash_key_name
+        return self.table.schema.hash_key_name
 
     @property
     def range_key_name(self):
-        return self._range_key_name
+        return self.table.schema.range_key_name
 
     def add_attribute(self, attr_name, attr_value):
         """
@@ -95,7 +101,8 @@ class Item(dict):
         :type attr_value: int|long|float|set
         :param attr_value: Value which is to be added to the attribute.
         """
-        self._updates[attr_name] = ("ADD", attr_value)
+        self._dirty_keys.discard(attr_name)
+        self._explicit_updates[attr_name] = ("ADD", attr_value)
 
     def delete_attribute(self, attr_name, attr_value=None):
         """
@@ -111,7 +118,8 @@ class Item(dict):
             This parameter is optional. If None, the whole attribute is
             removed from the item.
         """
-        self._updates[attr_name] = ("DELETE", attr_value)
+        self._dirty_keys.discard(attr_name)
+        self._explicit_updates[attr_name] = ("DELETE", attr_value)
 
     def put_attribute(self, attr_name, attr_value):
         """
@@ -125,7 +133,44 @@ class Item(dict):
         :type attr_value: int|long|float|str|set
         :param attr_value: New value of the attribute.
         """
-        self._updates[attr_name] = ("PUT", attr_value)
+        self._dirty_keys.discard(attr_name)
+        self._explicit_updates[attr_name] = ("PUT", attr_value)
+
+    def dynamized(self):
+        """
+        Return the attributes of this item encoded for DynamoDB.
+
+        The encoded attributes are cached as long as every value is an
+        immutable scalar, and the cache is dropped whenever the item
+        is modified, so writing an unchanged item again does not encode
+        it a second time.
+        """
+        dynamizer = self.table.layer2.dynamizer
+        cached = self._dynamized_cache
+        if cached is not None and cached[0] is dynamizer:
+            return cached[1]
+        encode = dynamizer.encode
+        d = dict((key, encode(value)) for key, value in self.items())
+        if all(value.__class__ in SCALAR_TYPES for value in self.values()):
+            self._dynamized_cache = (dynamizer, d)
+        return d
+
+    def _compute_updates(self):
+        """
+        Return the pending updates of this item as a dict mapping
+        attribute names to ``(action, value)`` tuples.  Attributes
+        assigned through the dict interface are only marked dirty and
+        their PUT actions are materialized here.
+        """
+        updates = dict(self._explicit_updates)
+        for key in self._dirty_keys:
+            updates[key] = ("PUT", self[key])
+        return updates
+
+    def _clear_updates(self):
+        """Forget all pending updates of this item."""
+        self._dirty_keys.clear()
+        self._explicit_updates.clear()
 
     @defer.inlineCallbacks
     def save(self, expected_value=None, return_values=None):
@@ -148,7 +193,13 @@ class Item(dict):
             the new version of the item are returned. If 'UPDATED_NEW' is
             specified, the new versions of only the updated attributes are
             returned.
+
+        If there are no pending updates and neither ``expected_value``
+        nor ``return_values`` is given, no request is sent.
         """
+        if (not self._dirty_keys and not self._explicit_updates and
+                expected_value is None and return_values is None):
+            defer.returnValue({'ConsumedCapacityUnits': 0})
         result = yield self.table.layer2.update_item(self, expected_value,
                                                      return_values)
         defer.returnValue(result)
@@ -201,18 +252,43 @@ class Item(dict):
         defer.returnValue(result)
 
     def __setitem__(self, key, value):
-        """Overrwrite the setter to instead update the _updates
-        method so this can act like a normal dict"""
-        if self._updates is not None:
-            self.put_attribute(key, value)
+        """Overrwrite the setter to mark the key dirty so its
+        update is queued and this can act like a normal dict"""
+        if self._dirty_keys is not None:
+            self._dirty_keys.add(key)
+            self._explicit_updates.pop(key, None)
+        self._dynamized_cache = None
         dict.__setitem__(self, key, value)
 
     def __delitem__(self, key):
         """Remove this key from the items"""
-        if self._updates is not None:
+        if self._dirty_keys is not None:
             self.delete_attribute(key)
+        self._dynamized_cache = None
         dict.__delitem__(self, key)
 
+    # The remaining dict mutators bypass __setitem__/__delitem__, so they
+    # only need to drop the cached encoding.
+    def update(self, *args, **kwargs):
+        self._dynamized_cache = None
+        dict.update(self, *args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._dynamized_cache = None
+        return dict.setdefault(self, key, default)
+
+    def pop(self, *args):
+        self._dynamized_cache = None
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._dynamized_cache = None
+        return dict.popitem(self)
+
+    def clear(self):
+        self._dynamized_cache = None
+        dict.clear(self)
+
     # Allow this item to still be pickled
     def __getstate__(self):
         return self.__dict__
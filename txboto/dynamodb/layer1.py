@@ -30,17 +30,42 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import logging
 import time
-from binascii import crc32
+from zlib import crc32
 
 import txboto
 from txboto.connection import AWSAuthConnection
 from txboto.exception import DynamoDBResponseError
 from txboto.provider import Provider
 from txboto.dynamodb import exceptions as dynamodb_exceptions
-from txboto.compat import json, to_str
+from txboto.compat import json, json_dumps_bytes, json_loads, simdjson, \
+    to_str
 
-from twisted.internet import defer
+from twisted.internet import defer, threads
+
+
+# Request bodies of the calls that only carry a table name, these are hit
+# repeatedly by loops polling describe_table for a table's status.
+_TABLE_NAME_BODIES = {}
+_MAX_TABLE_NAME_BODIES = 1024
+
+
+def _table_name_body(table_name):
+    body = _TABLE_NAME_BODIES.get(table_name)
+    if body is None:
+        if len(_TABLE_NAME_BODIES) >= _MAX_TABLE_NAME_BODIES:
+            _TABLE_NAME_BODIES.clear()
+        body = _TABLE_NAME_BODIES[table_name] = json_dumps_bytes(
+            {'TableName': table_name})
+    return body
+
+
+def _decode_body(body, object_hook=None):
+    if object_hook is None:
+        return json_loads(body)
+    # Only the stdlib decoder supports object_hook.
+    return json.loads(to_str(body), object_hook=object_hook)
 
 
 class Layer1(AWSAuthConnection):
@@ -80,9 +105,32 @@ class Layer1(AWSAuthConnection):
 
     ResponseError = DynamoDBResponseError
 
+    _faults = {
+        ConditionalCheckFailedError:
+            dynamodb_exceptions.DynamoDBConditionalCheckFailedError,
+        ValidationError: dynamodb_exceptions.DynamoDBValidationError,
+    }
+
     NumberRetries = 10
     """The number of times an error is retried."""
 
+    Actions = ('ListTables', 'DescribeTable', 'CreateTable', 'UpdateTable',
+               'DeleteTable', 'GetItem', 'BatchGetItem', 'BatchWriteItem',
+               'PutItem', 'UpdateItem', 'DeleteItem', 'Query', 'Scan')
+    """The API actions whose X-Amz-Target headers are built up front."""
+
+    _TARGET_PREFIX = '%s_%s.' % (ServiceName, Version)
+    _TARGETS = dict(zip(Actions, map(_TARGET_PREFIX.__add__, Actions)))
+
+    SimdJSONThreshold = 64 * 1024
+    """Size in bytes above which responses are decoded with simdjson,
+    if it is installed and enabled with ``use_simdjson``."""
+
+    ThreadedDecodeThreshold = 0
+    """Size in bytes above which responses are decoded in the reactor
+    thread pool instead of the reactor thread, 0 to never do so.  Can be
+    set with ``threaded_decode_threshold``."""
+
     def __init__(self, aws_access_key_id=None, aws_secret_access_key=None,
                  is_secure=True, port=None, proxy=None, proxy_port=None,
                  debug=0, security_token=None, region=None,
@@ -90,10 +138,7 @@ class Layer1(AWSAuthConnection):
         if not region:
             region_name = txboto.config.get('DynamoDB', 'region',
                                             self.DefaultRegionName)
-            for reg in txboto.dynamodb.regions():
-                if reg.name == region_name:
-                    region = reg
-                    break
+            region = txboto.dynamodb.get_region(region_name)
 
         self.region = region
         super(Layer1, self).__init__(self.region.endpoint,
@@ -104,8 +149,22 @@ class Layer1(AWSAuthConnection):
                                      validate_certs=validate_certs,
                                      profile_name=profile_name)
         self.throughput_exceeded_events = 0
+        # Only NumberRetries + 1 backoff delays can ever be asked for.
+        self._retry_sleeps = (0,) + tuple(
+            min(0.05 * (2 ** i), self.max_retry_delay)
+            for i in range(1, self.NumberRetries + 1))
+        self._base_headers = {'Host': self.region.endpoint,
+                              'Content-Type': 'application/x-amz-json-1.0'}
         self._validate_checksums = txboto.config.getbool(
             'DynamoDB', 'validate_checksums', validate_checksums)
+        self.ChecksumResponseBody = self._validate_checksums
+        self._simd_parser = None
+        if simdjson is not None and txboto.config.getbool(
+                'DynamoDB', 'use_simdjson', False):
+            self._simd_parser = simdjson.Parser()
+        self.ThreadedDecodeThreshold = txboto.config.getint(
+            'DynamoDB', 'threaded_decode_threshold',
+            self.ThreadedDecodeThreshold)
 
     def _get_session_token(self):
         self.provider = Provider(self._provider_type)
@@ -115,36 +174,50 @@ class Layer1(AWSAuthConnection):
         return ['hmac-v4']
 
     @defer.inlineCallbacks
-    def make_request(self, action, body='', object_hook=None):
+    def make_request(self, action, body=b'', object_hook=None):
         """
         :raises: ``DynamoDBExpiredTokenError`` if the security token expires.
         """
-        headers = {'X-Amz-Target': '%s_%s.%s' % (self.ServiceName,
-                                                 self.Version, action),
-                   'Host': self.region.endpoint,
-                   'Content-Type': 'application/x-amz-json-1.0',
-                   'Content-Length': str(len(body))}
+        target = self._TARGETS.get(action) or self._TARGET_PREFIX + action
+        headers = self._base_headers.copy()
+        headers['X-Amz-Target'] = target
+        headers['Content-Length'] = str(len(body))
         http_request = self.build_base_http_request('POST', '/', '/',
                                                     {}, headers, body, None)
-        start = time.time()
+        log_debug = txboto.log.isEnabledFor(logging.DEBUG)
+        log_perf = txboto.perflog.isEnabledFor(logging.DEBUG)
+        if log_perf:
+            start = time.time()
         response, response_body = yield self._mexe(
-            http_request, sender=None, override_num_retries=self.NumberRetries,
+            http_request, override_num_retries=self.NumberRetries,
             retry_handler=self._retry_handler)
-        elapsed = (time.time() - start) * 1000
-        request_id = response.getheader('x-amzn-RequestId')
-        txboto.log.debug('RequestId: %s' % request_id)
-        txboto.perflog.debug('%s: id=%s time=%sms',
-                             headers['X-Amz-Target'], request_id, int(elapsed))
-        txboto.log.debug(response_body)
-        defer.returnValue(json.loads(response_body, object_hook=object_hook))
-
-    def _retry_handler(self, response, i, next_sleep):
+        if log_debug or log_perf:
+            request_id = response.headers.getRawHeaders('x-amzn-RequestId',
+                                                        [None])[0]
+            txboto.log.debug('RequestId: %s', request_id)
+            if log_perf:
+                elapsed = (time.time() - start) * 1000
+                txboto.perflog.debug('%s: id=%s time=%sms',
+                                     target, request_id, int(elapsed))
+            txboto.log.debug(response_body)
+        size = len(response_body)
+        if (object_hook is None and self._simd_parser is not None and
+                size > self.SimdJSONThreshold):
+            defer.returnValue(self._simd_parser.parse(response_body).as_dict())
+        if self.ThreadedDecodeThreshold and size > self.ThreadedDecodeThreshold:
+            result = yield threads.deferToThread(_decode_body, response_body,
+                                                 object_hook)
+            defer.returnValue(result)
+        defer.returnValue(_decode_body(response_body, object_hook))
+
+    def _retry_handler(self, response, response_body, i, next_sleep):
         status = None
-        if response.status == 400:
-            response_body = response.read().decode('utf-8')
+        if response.code == 400:
             txboto.log.debug(response_body)
-            data = json.loads(to_str(response_body))
-            if self.ThruputError in data.get('__type'):
+            data = json_loads(response_body)
+            # __type looks like 'com.amazon.coral.service#ExpiredTokenException'
+            error_type = (data.get('__type') or '').rpartition('#')[2]
+            if error_type == self.ThruputError:
                 self.throughput_exceeded_events += 1
                 msg = "%s, retry attempt %s" % (self.ThruputError, i)
                 next_sleep = self._exponential_time(i)
@@ -155,26 +228,24 @@ class Layer1(AWSAuthConnection):
                     # a specific error saying that the throughput
                     # was exceeded.
                     raise dynamodb_exceptions.DynamoDBThroughputExceededError(
-                        response.status, response.reason, data)
-            elif self.SessionExpiredError in data.get('__type'):
+                        response.code, response.reason, data)
+            elif error_type == self.SessionExpiredError.rpartition('#')[2]:
                 msg = 'Renewing Session Token'
                 self._get_session_token()
                 status = (msg, i + self.num_retries - 1, 0)
-            elif self.ConditionalCheckFailedError in data.get('__type'):
-                raise dynamodb_exceptions.DynamoDBConditionalCheckFailedError(
-                    response.status, response.reason, data)
-            elif self.ValidationError in data.get('__type'):
-                raise dynamodb_exceptions.DynamoDBValidationError(
-                    response.status, response.reason, data)
             else:
-                raise self.ResponseError(response.status, response.reason,
-                                         data)
-        expected_crc32 = response.getheader('x-amz-crc32')
-        if self._validate_checksums and expected_crc32 is not None:
-            txboto.log.debug('Validating crc32 checksum for body: %s',
-                             response.read().decode('utf-8'))
-            actual_crc32 = crc32(response.read()) & 0xffffffff
-            expected_crc32 = int(expected_crc32)
+                exception_class = self._faults.get(error_type,
+                                                   self.ResponseError)
+                raise exception_class(response.code, response.reason, data)
+        expected_crc32 = response.headers.getRawHeaders('x-amz-crc32')
+        if self._validate_checksums and expected_crc32:
+            if txboto.log.isEnabledFor(logging.DEBUG):
+                txboto.log.debug('Validating crc32 checksum for body: %s',
+                                 response_body.decode('utf-8', 'replace'))
+            actual_crc32 = getattr(response, 'body_crc32', None)
+            if actual_crc32 is None:
+                actual_crc32 = crc32(response_body) & 0xffffffff
+            expected_crc32 = int(expected_crc32[0])
             if actual_crc32 != expected_crc32:
                 msg = ("The calculated checksum %s did not match the expected "
                        "checksum %s" % (actual_crc32, expected_crc32))
@@ -182,12 +253,9 @@ class Layer1(AWSAuthConnection):
         return status
 
     def _exponential_time(self, i):
-        if i == 0:
-            next_sleep = 0
-        else:
-            next_sleep = min(0.05 * (2 ** i),
-                             txboto.config.get('TxBoto', 'max_retry_delay', 60))
-        return next_sleep
+        if i < len(self._retry_sleeps):
+            return self._retry_sleeps[i]
+        return min(0.05 * (2 ** i), self.max_retry_delay)
 
     @defer.inlineCallbacks
     def list_tables(self, limit=None, start_table=None):
@@ -210,12 +278,15 @@ class Layer1(AWSAuthConnection):
             include a LastEvaluatedTableName attribute.  Use
             that value here to continue the listing.
         """
-        data = {}
-        if limit:
-            data['Limit'] = limit
-        if start_table:
-            data['ExclusiveStartTableName'] = start_table
-        json_input = json.dumps(data)
+        if not limit and not start_table:
+            json_input = b'{}'
+        else:
+            data = {}
+            if limit:
+                data['Limit'] = limit
+            if start_table:
+                data['ExclusiveStartTableName'] = start_table
+            json_input = json_dumps_bytes(data)
         result = yield self.make_request('ListTables', json_input)
         defer.returnValue(result)
 
@@ -229,8 +300,7 @@ class Layer1(AWSAuthConnection):
         :type table_name: str
         :param table_name: The name of the table to describe.
         """
-        data = {'TableName': table_name}
-        json_input = json.dumps(data)
+        json_input = _table_name_body(table_name)
         result = yield self.make_request('DescribeTable', json_input)
         defer.returnValue(result)
 
@@ -258,7 +328,7 @@ class Layer1(AWSAuthConnection):
         data = {'TableName': table_name,
                 'KeySchema': schema,
                 'ProvisionedThroughput': provisioned_throughput}
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('CreateTable', json_input)
         defer.returnValue(result)
 
@@ -277,7 +347,7 @@ class Layer1(AWSAuthConnection):
         """
         data = {'TableName': table_name,
                 'ProvisionedThroughput': provisioned_throughput}
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('UpdateTable', json_input)
         defer.returnValue(result)
 
@@ -291,8 +361,7 @@ class Layer1(AWSAuthConnection):
         :type table_name: str
         :param table_name: The name of the table to delete.
         """
-        data = {'TableName': table_name}
-        json_input = json.dumps(data)
+        json_input = _table_name_body(table_name)
         result = yield self.make_request('DeleteTable', json_input)
         defer.returnValue(result)
 
@@ -326,7 +395,7 @@ class Layer1(AWSAuthConnection):
             data['AttributesToGet'] = attributes_to_get
         if consistent_read:
             data['ConsistentRead'] = True
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('GetItem', json_input,
                                          object_hook=object_hook)
         if 'Item' not in result:
@@ -349,7 +418,7 @@ class Layer1(AWSAuthConnection):
         if not request_items:
             return {}
         data = {'RequestItems': request_items}
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('BatchGetItem', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -365,7 +434,7 @@ class Layer1(AWSAuthConnection):
             data structure defined by DynamoDB.
         """
         data = {'RequestItems': request_items}
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('BatchWriteItem', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -406,7 +475,7 @@ class Layer1(AWSAuthConnection):
             data['Expected'] = expected
         if return_values:
             data['ReturnValues'] = return_values
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('PutItem', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -450,7 +519,7 @@ class Layer1(AWSAuthConnection):
             data['Expected'] = expected
         if return_values:
             data['ReturnValues'] = return_values
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('UpdateItem', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -488,7 +557,7 @@ class Layer1(AWSAuthConnection):
             data['Expected'] = expected
         if return_values:
             data['ReturnValues'] = return_values
-        json_input = json.dumps(data)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('DeleteItem', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -540,25 +609,17 @@ class Layer1(AWSAuthConnection):
             which to continue an earlier query.  This would be
             provided as the LastEvaluatedKey in that query.
         """
-        data = {'TableName': table_name,
-                'HashKeyValue': hash_key_value}
-        if range_key_conditions:
-            data['RangeKeyCondition'] = range_key_conditions
-        if attributes_to_get:
-            data['AttributesToGet'] = attributes_to_get
-        if limit:
-            data['Limit'] = limit
-        if count:
-            data['Count'] = True
-        if consistent_read:
-            data['ConsistentRead'] = True
-        if scan_index_forward:
-            data['ScanIndexForward'] = True
-        else:
-            data['ScanIndexForward'] = False
-        if exclusive_start_key:
-            data['ExclusiveStartKey'] = exclusive_start_key
-        json_input = json.dumps(data)
+        data = {name: value for name, value in (
+            ('RangeKeyCondition', range_key_conditions),
+            ('AttributesToGet', attributes_to_get),
+            ('Limit', limit),
+            ('Count', bool(count)),
+            ('ConsistentRead', bool(consistent_read)),
+            ('ExclusiveStartKey', exclusive_start_key)) if value}
+        data['TableName'] = table_name
+        data['HashKeyValue'] = hash_key_value
+        data['ScanIndexForward'] = bool(scan_index_forward)
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('Query', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -597,18 +658,14 @@ class Layer1(AWSAuthConnection):
             which to continue an earlier query.  This would be
             provided as the LastEvaluatedKey in that query.
         """
-        data = {'TableName': table_name}
-        if scan_filter:
-            data['ScanFilter'] = scan_filter
-        if attributes_to_get:
-            data['AttributesToGet'] = attributes_to_get
-        if limit:
-            data['Limit'] = limit
-        if count:
-            data['Count'] = True
-        if exclusive_start_key:
-            data['ExclusiveStartKey'] = exclusive_start_key
-        json_input = json.dumps(data)
+        data = {name: value for name, value in (
+            ('ScanFilter', scan_filter),
+            ('AttributesToGet', attributes_to_get),
+            ('Limit', limit),
+            ('Count', bool(count)),
+            ('ExclusiveStartKey', exclusive_start_key)) if value}
+        data['TableName'] = table_name
+        json_input = json_dumps_bytes(data)
         result = yield self.make_request('Scan', json_input,
                                          object_hook=object_hook)
         defer.returnValue(result)
@@ -34,7 +34,7 @@ from txboto.dynamodb.layer1 import Layer1
 from txboto.dynamodb.table import Table
 from txboto.dynamodb.schema import Schema
 from txboto.dynamodb.item import Item
-from txboto.dynamodb.batch import BatchList, BatchWriteList
+from txboto.dynamodb.batch import AutoBatchWriter, BatchList, BatchWriteList
 from txboto.dynamodb.types import get_dynamodb_type, Dynamizer, \
         LossyFloatDynamizer, NonBooleanDynamizer
 
@@ -180,6 +180,28 @@ class Layer2(object):
                              validate_certs=validate_certs,
                              profile_name=profile_name)
         self.dynamizer = dynamizer()
+        self.auto_batch = None
+
+    def enable_auto_batch(self, max_items=25, max_wait_ms=10):
+        """
+        Queue unconditional ``put_item`` and ``delete_item`` calls and
+        send them as BatchWriteItem requests of up to ``max_items``
+        operations, waiting at most ``max_wait_ms`` milliseconds for a
+        batch to fill up.  Calls passing ``expected_value`` or
+        ``return_values`` are still sent on their own.
+        """
+        self.auto_batch = AutoBatchWriter(self, max_items,
+                                          max_wait_ms / 1000.0)
+
+    def disable_auto_batch(self):
+        """
+        Stop queueing writes.  Returns a Deferred firing once the
+        writes still queued have been sent.
+        """
+        auto_batch, self.auto_batch = self.auto_batch, None
+        if auto_batch is None:
+            return defer.succeed(None)
+        return auto_batch.flush()
 
     def use_decimals(self, use_boolean=False):
         """
@@ -198,22 +220,21 @@ class Layer2(object):
         Convert a set of pending item updates into the structure
         required by Layer1.
         """
+        encode = self.dynamizer.encode
         d = {}
-        for attr_name in pending_updates:
-            action, value = pending_updates[attr_name]
+        for attr_name, (action, value) in pending_updates.items():
             if value is None:
                 # DELETE without an attribute value
                 d[attr_name] = {"Action": action}
             else:
-                d[attr_name] = {"Action": action,
-                                "Value": self.dynamizer.encode(value)}
+                d[attr_name] = {"Action": action, "Value": encode(value)}
         return d
 
     def dynamize_item(self, item):
-        d = {}
-        for attr_name in item:
-            d[attr_name] = self.dynamizer.encode(item[attr_name])
-        return d
+        if isinstance(item, Item):
+            return item.dynamized()
+        encode = self.dynamizer.encode
+        return {name: encode(value) for name, value in item.items()}
 
     def dynamize_range_key_condition(self, range_key_condition):
         """
@@ -303,6 +324,38 @@ class Layer2(object):
             dynamodb_key['RangeKeyElement'] = dynamodb_value
         return dynamodb_key
 
+    def build_keys_from_values(self, schema, keys):
+        """
+        Build a list of Key structures from a list of keys, validating
+        each against the schema like :meth:`build_key_from_values`.
+
+        :type keys: list
+        :param keys: A list of scalar or tuple values.  Each element is
+            either a hash key or a tuple of (hash_key, range_key).
+        """
+        encode = self.dynamizer.encode
+        hash_key_type = schema.hash_key_type
+        range_key_type = schema.range_key_type
+        key_list = []
+        for key in keys:
+            if isinstance(key, tuple):
+                hash_key, range_key = key
+            else:
+                hash_key, range_key = key, None
+            dynamodb_value = encode(hash_key)
+            if next(iter(dynamodb_value)) != hash_key_type:
+                msg = 'Hashkey must be of type: %s' % hash_key_type
+                raise TypeError(msg)
+            dynamodb_key = {'HashKeyElement': dynamodb_value}
+            if range_key is not None:
+                dynamodb_value = encode(range_key)
+                if next(iter(dynamodb_value)) != range_key_type:
+                    msg = 'RangeKey must be of type: %s' % range_key_type
+                    raise TypeError(msg)
+                dynamodb_key['RangeKeyElement'] = dynamodb_value
+            key_list.append(dynamodb_key)
+        return key_list
+
     def new_batch_list(self):
         """
         Return a new, empty :class:`txboto.dynamodb.batch.BatchList`
@@ -546,9 +599,13 @@ class Layer2(object):
             list of :class:`txboto.dynamoddb.batch.Batch` objects.
             Each Batch object contains the information about one
             batch of objects that you wish to retrieve in this
-            request.
+            request.  An already built RequestItems dict is passed
+            through as is.
         """
-        request_items = batch_list.to_dict()
+        if isinstance(batch_list, dict):
+            request_items = batch_list
+        else:
+            request_items = batch_list.to_dict()
         result = yield self.layer1.batch_get_item(
             request_items, object_hook=self.dynamizer.decode)
         defer.returnValue(result)
@@ -562,9 +619,13 @@ class Layer2(object):
         :param batch_list: A BatchWriteList object which consists of a
             list of :class:`txboto.dynamoddb.batch.BatchWrite` objects.
             Each Batch object contains the information about one
-            batch of objects that you wish to put or delete.
+            batch of objects that you wish to put or delete.  An
+            already built RequestItems dict is passed through as is.
         """
-        request_items = batch_list.to_dict()
+        if isinstance(batch_list, dict):
+            request_items = batch_list
+        else:
+            request_items = batch_list.to_dict()
         result = yield self.layer1.batch_write_item(
             request_items, object_hook=self.dynamizer.decode)
         defer.returnValue(result)
@@ -592,6 +653,10 @@ class Layer2(object):
             specified and the item is overwritten, the content
             of the old item is returned.
         """
+        if (self.auto_batch is not None and expected_value is None and
+                return_values is None):
+            result = yield self.auto_batch.put(item)
+            defer.returnValue(result)
         expected_value = self.dynamize_expected_value(expected_value)
         result = yield self.layer1.put_item(
             item.table.name, self.dynamize_item(item),
@@ -633,13 +698,14 @@ class Layer2(object):
         expected_value = self.dynamize_expected_value(expected_value)
         key = self.build_key_from_values(item.table.schema,
                                          item.hash_key, item.range_key)
-        attr_updates = self.dynamize_attribute_updates(item._updates)
+        attr_updates = self.dynamize_attribute_updates(
+            item._compute_updates())
 
         result = yield self.layer1.update_item(
             item.table.name, key, attr_updates,
             expected_value, return_values, object_hook=self.dynamizer.decode)
 
-        item._updates.clear()
+        item._clear_updates()
         if 'ConsumedCapacityUnits' in result:
             item.consumed_units = result['ConsumedCapacityUnits']
         defer.returnValue(result)
@@ -666,6 +732,10 @@ class Layer2(object):
             specified and the item is overwritten, the content
             of the old item is returned.
         """
+        if (self.auto_batch is not None and expected_value is None and
+                return_values is None):
+            result = yield self.auto_batch.delete(item)
+            defer.returnValue(result)
         expected_value = self.dynamize_expected_value(expected_value)
         key = self.build_key_from_values(item.table.schema,
                                          item.hash_key, item.range_key)
@@ -45,9 +45,32 @@ class Schema(object):
         passed to Layer1 methods.
     """
 
+    __slots__ = ('_schema_dict', '_key', '_hash_key_name', '_hash_key_type',
+                 '_range_key_name', '_range_key_type')
+
     def __init__(self, schema_dict):
         self._dict = schema_dict
 
+    def _get_dict(self):
+        return self._schema_dict
+
+    def _set_dict(self, schema_dict):
+        # The key names are read for every Item built from this schema,
+        # so they are looked up once here instead of on each access.
+        self._schema_dict = schema_dict
+        hash_key = range_key = {}
+        if schema_dict:
+            hash_key = schema_dict['HashKeyElement']
+            range_key = schema_dict.get('RangeKeyElement', {})
+        self._key = (hash_key.get('AttributeName'),
+                     hash_key.get('AttributeType'),
+                     range_key.get('AttributeName'),
+                     range_key.get('AttributeType'))
+        (self._hash_key_name, self._hash_key_type,
+         self._range_key_name, self._range_key_type) = self._key
+
+    _dict = property(_get_dict, _set_dict)
+
     def __repr__(self):
         if self.range_key_name:
             s = 'Schema(%s:%s)' % (self.hash_key_name, self.range_key_name)
@@ -93,28 +116,25 @@ class Schema(object):
 
     @property
     def hash_key_name(self):
-        return self._dict['HashKeyElement']['AttributeName']
+        return self._hash_key_name
 
     @property
     def hash_key_type(self):
-        return self._dict['HashKeyElement']['AttributeType']
+        return self._hash_key_type
 
     @property
     def range_key_name(self):
-        name = None
-        if 'RangeKeyElement' in self._dict:
-            name = self._dict['RangeKeyElement']['AttributeName']
-        return name
+        return self._range_key_name
 
     @property
     def range_key_type(self):
-        type = None
-        if 'RangeKeyElement' in self._dict:
-            type = self._dict['RangeKeyElement']['AttributeType']
-        return type
+        return self._range_key_type
 
     def __eq__(self, other):
-        return (self.hash_key_name == other.hash_key_name and
-                self.hash_key_type == other.hash_key_type and
-                self.range_key_name == other.range_key_name and
-                self.range_key_type == other.range_key_type)
+        return self._key == other._key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._key)
@@ -29,14 +29,12 @@
 # OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import time
-
 from txboto.dynamodb.batch import BatchList
 from txboto.dynamodb.schema import Schema
 from txboto.dynamodb.item import Item
 from txboto.dynamodb import exceptions as dynamodb_exceptions
 
-from twisted.internet import defer
+from twisted.internet import defer, task
 
 
 class TableBatchGenerator(object):
@@ -252,7 +250,9 @@ class Table(object):
                 if self.status == 'ACTIVE':
                     done = True
                 else:
-                    time.sleep(retry_seconds)
+                    from twisted.internet import reactor
+                    yield task.deferLater(reactor, retry_seconds,
+                                          lambda: None)
             else:
                 done = True
 
@@ -183,6 +183,12 @@ else:
             return 'Binary(%r)' % self.value
 
 
+# Scalar types whose DynamoDB type only depends on the Python type, so
+# Dynamizer.encode can remember the encoder it picked for them.
+SCALAR_TYPES = frozenset(six.integer_types + (
+    float, Decimal, bool, six.text_type, bytes, Binary, type(None)))
+
+
 def item_object_hook(dct):
     """
     A custom object hook for use when decoding JSON item bodys.
@@ -239,6 +245,8 @@ class Dynamizer(object):
         'foo'     (Python type)
 
     """
+    _encoder_cache = None
+
     def _get_dynamodb_type(self, attr):
         return get_dynamodb_type(attr)
 
@@ -248,12 +256,24 @@ class Dynamizer(object):
         by DynamoDB.
 
         """
+        attr_class = type(attr)
+        # The bound encoders of this instance, by scalar python type.
+        cache = self._encoder_cache
+        if cache is None:
+            cache = self._encoder_cache = {}
+        else:
+            entry = cache.get(attr_class)
+            if entry is not None:
+                dynamodb_type, encoder = entry
+                return {dynamodb_type: encoder(attr)}
         dynamodb_type = self._get_dynamodb_type(attr)
         try:
             encoder = getattr(self, '_encode_%s' % dynamodb_type.lower())
         except AttributeError:
             raise ValueError("Unable to encode dynamodb type: %s" %
                              dynamodb_type)
+        if attr_class in SCALAR_TYPES:
+            cache[attr_class] = (dynamodb_type, encoder)
         return {dynamodb_type: encoder(attr)}
 
     def _encode_n(self, attr):
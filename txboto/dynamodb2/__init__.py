@@ -30,7 +30,7 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from txboto.regioninfo import get_regions
+from txboto.regioninfo import get_region as _get_region, get_regions
 
 
 def regions():
@@ -44,8 +44,20 @@ def regions():
     return get_regions('dynamodb', connection_cls=DynamoDBConnection)
 
 
+def get_region(region_name):
+    """
+    Look up a region by name.
+
+    :rtype: :class:`txboto.regioninfo.RegionInfo`
+    :return: The region, or ``None`` if there is no such region.
+    """
+    from txboto.dynamodb2.layer1 import DynamoDBConnection
+    return _get_region('dynamodb', region_name,
+                       connection_cls=DynamoDBConnection)
+
+
 def connect_to_region(region_name, **kw_params):
-    for region in regions():
-        if region.name == region_name:
-            return region.connect(**kw_params)
+    region = get_region(region_name)
+    if region is not None:
+        return region.connect(**kw_params)
     return None
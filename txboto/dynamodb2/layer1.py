@@ -29,12 +29,12 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from binascii import crc32
+from zlib import crc32
 
 from twisted.internet import defer
 
 import txboto
-from txboto.compat import json, to_str
+from txboto.compat import json_dumps, json_loads, to_str
 from txboto.connection import AWSQueryConnection
 from txboto.exception import JSONResponseError
 from txboto.dynamodb2 import exceptions
@@ -176,10 +176,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if not region:
             region_name = txboto.config.get('DynamoDB', 'region',
                                             self.DefaultRegionName)
-            for reg in txboto.dynamodb2.regions():
-                if reg.name == region_name:
-                    region = reg
-                    break
+            region = txboto.dynamodb2.get_region(region_name)
 
         # Only set host if it isn't manually overwritten
         if 'host' not in kwargs:
@@ -188,7 +185,12 @@ class DynamoDBConnection(AWSQueryConnection):
         self.region = region
         self._validate_checksums = txboto.config.getbool(
             'DynamoDB', 'validate_checksums', validate_checksums)
+        self.ChecksumResponseBody = self._validate_checksums
         self.throughput_exceeded_events = 0
+        # Only NumberRetries + 1 backoff delays can ever be asked for.
+        self._retry_sleeps = (0,) + tuple(
+            min(0.05 * (2 ** i), self.max_retry_delay)
+            for i in range(1, self.NumberRetries + 1))
 
     def _required_auth_capability(self):
         return ['hmac-v4']
@@ -292,7 +294,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if return_consumed_capacity is not None:
             params['ReturnConsumedCapacity'] = return_consumed_capacity
         response = yield self.make_request(action='BatchGetItem',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -433,7 +435,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if return_item_collection_metrics is not None:
             params['ReturnItemCollectionMetrics'] = return_item_collection_metrics
         response = yield self.make_request(action='BatchWriteItem',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -583,7 +585,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if global_secondary_indexes is not None:
             params['GlobalSecondaryIndexes'] = global_secondary_indexes
         response = yield self.make_request(action='CreateTable',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -950,7 +952,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if expression_attribute_values is not None:
             params['ExpressionAttributeValues'] = expression_attribute_values
         response = yield self.make_request(action='DeleteItem',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -983,7 +985,7 @@ class DynamoDBConnection(AWSQueryConnection):
         """
         params = {'TableName': table_name, }
         response = yield self.make_request(action='DeleteTable',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -1007,7 +1009,7 @@ class DynamoDBConnection(AWSQueryConnection):
         """
         params = {'TableName': table_name, }
         response = yield self.make_request(action='DescribeTable',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -1130,7 +1132,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if expression_attribute_names is not None:
             params['ExpressionAttributeNames'] = expression_attribute_names
         response = yield self.make_request(action='GetItem',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -1157,7 +1159,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if limit is not None:
             params['Limit'] = limit
         response = yield self.make_request(action='ListTables',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -1552,7 +1554,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if expression_attribute_values is not None:
             params['ExpressionAttributeValues'] = expression_attribute_values
         response = yield self.make_request(action='PutItem',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -1988,7 +1990,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if expression_attribute_values is not None:
             params['ExpressionAttributeValues'] = expression_attribute_values
         response = yield self.make_request(action='Query',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -2293,7 +2295,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if expression_attribute_values is not None:
             params['ExpressionAttributeValues'] = expression_attribute_values
         response = yield self.make_request(action='Scan',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -2828,7 +2830,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if expression_attribute_values is not None:
             params['ExpressionAttributeValues'] = expression_attribute_values
         response = yield self.make_request(action='UpdateItem',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -2893,7 +2895,7 @@ class DynamoDBConnection(AWSQueryConnection):
         if global_secondary_index_updates is not None:
             params['GlobalSecondaryIndexUpdates'] = global_secondary_index_updates
         response = yield self.make_request(action='UpdateTable',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -2914,9 +2916,9 @@ class DynamoDBConnection(AWSQueryConnection):
         txboto.log.debug(response_body)
         if response.code == 200:
             if response_body:
-                defer.returnValue(json.loads(to_str(response_body)))
+                defer.returnValue(json_loads(to_str(response_body)))
         else:
-            json_body = json.loads(to_str(response_body))
+            json_body = json_loads(to_str(response_body))
             fault_name = json_body.get('__type', None)
             exception_class = self._faults.get(fault_name, self.ResponseError)
             raise exception_class(response.code, response.reason,
@@ -2927,7 +2929,7 @@ class DynamoDBConnection(AWSQueryConnection):
         txboto.log.debug("Saw HTTP status: %s" % response.code)
         if response.code == 400:
             txboto.log.debug(response_body)
-            data = json.loads(to_str(response_body))
+            data = json_loads(to_str(response_body))
             if 'ProvisionedThroughputExceededException' in data.get('__type'):
                 self.throughput_exceeded_events += 1
                 msg = "%s, retry attempt %s" % (
@@ -2961,7 +2963,9 @@ class DynamoDBConnection(AWSQueryConnection):
         if self._validate_checksums and expected_crc32 is not None:
             txboto.log.debug('Validating crc32 checksum for body: %s',
                              response_body)
-            actual_crc32 = crc32(response_body) & 0xffffffff
+            actual_crc32 = getattr(response, 'body_crc32', None)
+            if actual_crc32 is None:
+                actual_crc32 = crc32(response_body) & 0xffffffff
             expected_crc32 = int(expected_crc32)
             if actual_crc32 != expected_crc32:
                 msg = ("The calculated checksum %s did not match the expected "
@@ -2970,9 +2974,6 @@ class DynamoDBConnection(AWSQueryConnection):
         return status
 
     def _truncated_exponential_time(self, i):
-        if i == 0:
-            next_sleep = 0
-        else:
-            next_sleep = min(0.05 * (2 ** i),
-                             txboto.config.get('TxBoto', 'max_retry_delay', 60))
-        return next_sleep
+        if i < len(self._retry_sleeps):
+            return self._retry_sleeps[i]
+        return min(0.05 * (2 ** i), self.max_retry_delay)
@@ -29,9 +29,28 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
+from collections import deque
+
 from twisted.internet import defer
 
 
+class _HeldFailure(object):
+    """
+    Wraps the failure of a prefetched page, so that it is only raised once
+    the page is asked for rather than logged as unhandled if it never is.
+    """
+    __slots__ = ('failure',)
+
+    def __init__(self, failure):
+        self.failure = failure
+
+
+def _unhold(result):
+    if isinstance(result, _HeldFailure):
+        return result.failure
+    return result
+
+
 class ResultSet(object):
     """
     A class used to lazily handle page-to-page navigation through a set of
@@ -44,6 +63,11 @@ class ResultSet(object):
 
     This is used by the ``Table.query`` & ``Table.scan`` methods.
 
+    With ``prefetch``, the request for the next page is sent as soon as a
+    page arrives, so that it is fetched while the current one is being
+    consumed.  This costs a request (and read capacity) even if iteration
+    stops before that page is needed.
+
     Example::
 
         >>> users = Table('users')
@@ -54,10 +78,14 @@ class ResultSet(object):
         ...     print res['username']
 
     """
-    def __init__(self, max_page_size=None):
+    __slots__ = ('the_callable', 'call_args', 'call_kwargs', '_results',
+                 '_offset', '_results_left', '_last_key_seen', '_fetches',
+                 '_max_page_size', '_limit', '_prefetch', '_next_page')
+
+    def __init__(self, max_page_size=None, prefetch=False):
         super(ResultSet, self).__init__()
         self.the_callable = None
-        self.call_args = []
+        self.call_args = ()
         self.call_kwargs = {}
         self._results = []
         self._offset = 0
@@ -66,6 +94,8 @@ class ResultSet(object):
         self._fetches = 0
         self._max_page_size = max_page_size
         self._limit = None
+        self._prefetch = prefetch
+        self._next_page = None
 
     @property
     def first_key(self):
@@ -98,34 +128,64 @@ class ResultSet(object):
                     # do your things...
 
         """
-        if self._offset >= len(self._results):
+        results = self._results
+        offset = self._offset
+
+        if offset >= len(results):
             if self._results_left is False:
                 raise StopIteration()
 
             # this will return a deferred so we have to yield in the for loop!!
+            # If the page it fetches turns out empty while there are more
+            # results left, the next call simply fetches again.
             return self.fetch_more()
 
-            # It's possible that previous call to ``fetch_more`` may not return
-            # anything useful but there may be more results. Loop until we get
-            # something back, making sure we guard for no results left.
-            while not len(self._results) and self._results_left:
-                # this will return a deferred so we have to yield in the for loop!!
-                return self.fetch_more()
+        if self._limit is not None:
+            self._limit -= 1
 
-        if self._offset < len(self._results):
-            if self._limit is not None:
-                self._limit -= 1
-
-                if self._limit < 0:
-                    raise StopIteration()
+            if self._limit < 0:
+                raise StopIteration()
 
-            self._offset += 1
-            return self._results[self._offset - 1]
-        else:
-            raise StopIteration()
+        self._offset = offset + 1
+        return results[offset]
 
     next = __next__
 
+    def batches(self):
+        """
+        Iterates over the results a page at a time rather than one result at
+        a time, yielding lists of results (cut short by ``limit`` if needed).
+
+        As with iterating over the ``ResultSet`` itself, a deferred is
+        yielded whenever the next page has to be fetched, and it must have
+        fired before iteration goes on::
+
+            for batch in resultset.batches():
+                if isinstance(batch, defer.Deferred):
+                    yield batch
+                else:
+                    items.extend(batch)
+
+        """
+        while True:
+            results = self._results
+            offset = self._offset
+            if offset >= len(results):
+                if self._results_left is False:
+                    return
+                yield self.fetch_more()
+                continue
+
+            end = len(results)
+            if self._limit is not None:
+                if self._limit <= 0:
+                    return
+                end = min(end, offset + self._limit)
+                self._limit -= end - offset
+
+            self._offset = end
+            yield results[offset:end]
+
     def to_call(self, the_callable, *args, **kwargs):
         """
         Sets up the callable & any arguments to run it with.
@@ -161,7 +221,6 @@ class ResultSet(object):
         self.call_args = args
         self.call_kwargs = kwargs
 
-    @defer.inlineCallbacks
     def fetch_more(self):
         """
         When the iterator runs out of results, this method is run to re-execute
@@ -171,27 +230,60 @@ class ResultSet(object):
         """
         self._reset()
 
-        args = self.call_args[:]
+        page, self._next_page = self._next_page, None
+        if page is None:
+            page = self._fetch_page()
+        else:
+            page.addCallback(_unhold)
+        return page.addCallback(self._page_fetched)
+
+    def _page_fetched(self, results):
+        self._absorb_page(results)
+
+        # No need to prefetch when the results at hand reach the limit.
+        if self._prefetch and self._results_left and (
+                self._limit is None or
+                self._limit > len(self._results) - self._offset):
+            self._next_page = self._fetch_page().addErrback(_HeldFailure)
+
+    def _fetch_page(self):
+        """
+        Runs the callable for the page following the last one absorbed and
+        returns a ``Deferred`` firing with its raw results.
+        """
+        kwargs = self._page_kwargs(self._last_key_seen)
+        return defer.maybeDeferred(self.the_callable, *self.call_args,
+                                   **kwargs)
+
+    def _page_kwargs(self, start_key):
+        """
+        Returns the keyword arguments to fetch the page starting after
+        ``start_key`` with.
+        """
         kwargs = self.call_kwargs.copy()
 
-        if self._last_key_seen is not None:
-            kwargs[self.first_key] = self._last_key_seen
+        if start_key is not None:
+            kwargs[self.first_key] = start_key
+
+        # Ask for at most max_page_size results, and never for more than
+        #   are still needed to reach the limit.  Results already fetched
+        #   but not iterated over yet (when prefetching) count as well.
+        page_size = self._max_page_size
+        if self._limit is not None:
+            needed = max(self._limit - (len(self._results) - self._offset), 0)
+            if page_size is None or page_size > needed:
+                page_size = needed
 
-        # If the page size is greater than limit set them
-        #   to the same value
-        if (self._limit and self._max_page_size and
-                self._max_page_size > self._limit):
-            self._max_page_size = self._limit
+        if page_size is not None:
+            kwargs['limit'] = page_size
 
-        # Put in the max page size.
-        if self._max_page_size is not None:
-            kwargs['limit'] = self._max_page_size
-        elif self._limit is not None:
-            # If max_page_size is not set and limit is available
-            #   use it as the page size
-            kwargs['limit'] = self._limit
+        return kwargs
 
-        results = yield defer.maybeDeferred(self.the_callable, *args, **kwargs)
+    def _absorb_page(self, results):
+        """
+        Stores a page returned by the callable and works out whether there
+        are more pages to fetch.
+        """
         self._fetches += 1
         new_results = results.get('results', [])
         self._last_key_seen = results.get('last_key', None)
@@ -212,42 +304,100 @@ class ResultSet(object):
             self._results_left = False
 
 
+class ParallelScanResultSet(ResultSet):
+    """
+    A ``ResultSet`` scanning all ``total_segments`` segments of a table at
+    once: each page is made of one request per segment that still has
+    results left, sent concurrently, and holds the results of all of them.
+
+    The callable is called with ``segment`` & ``total_segments`` on top of
+    its usual arguments.
+    """
+    __slots__ = ('_total_segments', '_segment_keys', '_segments_left')
+
+    def __init__(self, *args, **kwargs):
+        self._total_segments = kwargs.pop('total_segments')
+        super(ParallelScanResultSet, self).__init__(*args, **kwargs)
+        self._segment_keys = [None] * self._total_segments
+        self._segments_left = list(range(self._total_segments))
+
+    def _fetch_page(self):
+        args = self.call_args
+        segments = list(self._segments_left)
+        pages = []
+
+        for segment in segments:
+            kwargs = self._page_kwargs(self._segment_keys[segment])
+            kwargs['segment'] = segment
+            kwargs['total_segments'] = self._total_segments
+            pages.append(
+                defer.maybeDeferred(self.the_callable, *args, **kwargs))
+
+        d = defer.DeferredList(pages, consumeErrors=True)
+        d.addCallback(self._collect_segments, segments)
+        return d
+
+    def _collect_segments(self, outcomes, segments):
+        pages = []
+        for segment, (success, result) in zip(segments, outcomes):
+            if not success:
+                result.raiseException()
+            pages.append((segment, result))
+        return pages
+
+    def _absorb_page(self, pages):
+        self._fetches += 1
+        found = 0
+
+        for segment, results in pages:
+            new_results = results.get('results', [])
+            found += len(new_results)
+            self._results.extend(new_results)
+            self._segment_keys[segment] = results.get('last_key', None)
+
+        # A segment is done once it no longer returns a ``last_key``.
+        self._segments_left = [segment for segment, _ in pages
+                               if self._segment_keys[segment] is not None]
+        self._results_left = len(self._segments_left) > 0
+
+        # Check the limit, if it's present.
+        if (self._limit is not None and self._limit >= 0 and
+                self._limit - found <= 0):
+            self._results_left = False
+
+
 class BatchGetResultSet(ResultSet):
+    __slots__ = ('_keys_left', '_max_batch_get')
+
     def __init__(self, *args, **kwargs):
-        self._keys_left = kwargs.pop('keys', [])
+        self._keys_left = deque(kwargs.pop('keys', []))
         self._max_batch_get = kwargs.pop('max_batch_get', 100)
         super(BatchGetResultSet, self).__init__(*args, **kwargs)
 
-    @defer.inlineCallbacks
-    def fetch_more(self):
-        self._reset()
-
-        args = self.call_args[:]
+    def _fetch_page(self):
         kwargs = self.call_kwargs.copy()
 
-        # Slice off the max we can fetch.
-        kwargs['keys'] = self._keys_left[:self._max_batch_get]
-        self._keys_left = self._keys_left[self._max_batch_get:]
-
-        if len(self._keys_left) <= 0:
-            self._results_left = False
-
-        results = yield defer.maybeDeferred(self.the_callable, *args, **kwargs)
+        # Take off the max we can fetch.
+        keys_left = self._keys_left
+        kwargs['keys'] = [keys_left.popleft() for _ in
+                          range(min(self._max_batch_get, len(keys_left)))]
 
-        if not len(results.get('results', [])):
-            defer.returnValue(None)
+        return defer.maybeDeferred(self.the_callable, *self.call_args,
+                                   **kwargs)
 
-        self._results.extend(results['results'])
+    def _absorb_page(self, results):
+        self._results.extend(results.get('results', []))
 
-        for offset, key_data in enumerate(results.get('unprocessed_keys', [])):
-            # We've got an unprocessed key. Reinsert it into the list.
-            # DynamoDB only returns valid keys, so there should be no risk of
-            # missing keys ever making it here.
-            self._keys_left.insert(offset, key_data)
+        # Put the unprocessed keys back at the front of the queue, in order.
+        # DynamoDB only returns valid keys, so there should be no risk of
+        # missing keys ever making it here.
+        self._keys_left.extendleft(
+            reversed(results.get('unprocessed_keys', [])))
 
-        if len(self._keys_left) > 0:
-            self._results_left = True
+        # The next page is only prefetched once the unprocessed keys of
+        # this one are back in the queue, so none of them can be skipped.
+        self._results_left = len(self._keys_left) > 0
 
         # Decrease the limit, if it's present.
         if self.call_kwargs.get('limit'):
-            self.call_kwargs['limit'] -= len(results['results'])
+            self.call_kwargs['limit'] -= len(results.get('results', []))
@@ -39,7 +39,8 @@ from txboto.dynamodb2.fields import (HashKey, RangeKey,
                                      GlobalIncludeIndex)
 from txboto.dynamodb2.items import Item
 from txboto.dynamodb2.layer1 import DynamoDBConnection
-from txboto.dynamodb2.results import ResultSet, BatchGetResultSet
+from txboto.dynamodb2.results import ResultSet, BatchGetResultSet, \
+    ParallelScanResultSet
 from txboto.dynamodb2.types import (NonBooleanDynamizer, Dynamizer,
                                     FILTER_OPERATORS, QUERY_OPERATORS, STRING)
 from txboto.exception import JSONResponseError
@@ -1455,7 +1456,8 @@ class Table(object):
         Optionally accepts a ``total_segments`` parameter, which should be an
         integer count of number of segments to divide the table into.
         Please see the documentation about Parallel Scans (Default: ``None`` -
-        no segments)
+        no segments). If it is given without a ``segment``, all the segments
+        are scanned concurrently and their results returned together.
 
         Optionally accepts a ``max_page_size`` parameter, which should be an
         integer count of the maximum number of items to retrieve
@@ -1494,9 +1496,17 @@ class Table(object):
             'Alice'
 
         """
-        results = ResultSet(
-            max_page_size=max_page_size
-        )
+        if total_segments and segment is None:
+            results = ParallelScanResultSet(
+                max_page_size=max_page_size,
+                total_segments=total_segments
+            )
+            # Each request gets its own segment from the ``ResultSet``.
+            total_segments = None
+        else:
+            results = ResultSet(
+                max_page_size=max_page_size
+            )
         kwargs = filter_kwargs.copy()
         kwargs.update({
             'limit': limit,
@@ -34,6 +34,7 @@ Exception classes - Subclassing allows you to check for specific errors
 """
 import base64
 import xml.sax
+from xml.parsers import expat
 
 import txboto
 
@@ -121,7 +122,8 @@ class BotoServerError(StandardError):
                 try:
                     h = handler.XmlHandlerWrapper(self, self)
                     h.parseString(self.body)
-                except (TypeError, xml.sax.SAXParseException):
+                except (TypeError, xml.sax.SAXParseException,
+                        expat.ExpatError):
                     # What if it's JSON? Let's try that.
                     try:
                         parsed = json.loads(to_str(self.body))
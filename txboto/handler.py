@@ -30,8 +30,12 @@
 
 
 import xml.sax
+from xml.parsers import expat
 
-from txboto.compat import StringIO
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
 
 
 class XmlHandler(xml.sax.ContentHandler):
@@ -39,32 +43,108 @@ class XmlHandler(xml.sax.ContentHandler):
     def __init__(self, root_node, connection):
         self.connection = connection
         self.nodes = [('root', root_node)]
-        self.current_text = ''
+        # Text chunks of the current element, joined once it ends.
+        self._text = []
+
+    def _get_current_text(self):
+        return ''.join(self._text)
+
+    def _set_current_text(self, value):
+        self._text = [value] if value else []
+
+    current_text = property(_get_current_text, _set_current_text)
 
     def startElement(self, name, attrs):
-        self.current_text = ''
+        self._text = []
         new_node = self.nodes[-1][1].startElement(name, attrs, self.connection)
         if new_node is not None:
             self.nodes.append((name, new_node))
 
     def endElement(self, name):
-        self.nodes[-1][1].endElement(name, self.current_text, self.connection)
+        self.nodes[-1][1].endElement(name, ''.join(self._text),
+                                     self.connection)
         if self.nodes[-1][0] == name:
             if hasattr(self.nodes[-1][1], 'endNode'):
                 self.nodes[-1][1].endNode(self.connection)
             self.nodes.pop()
-        self.current_text = ''
+        self._text = []
 
     def characters(self, content):
-        self.current_text += content
+        self._text.append(content)
+
+
+def _expat_parser(handler):
+    """
+    Returns a new expat parser calling the methods of ``handler``, an
+    :class:`XmlHandler`, directly.  Expat parsers cannot be reused once a
+    document is complete, but creating one is cheap, unlike going through
+    the ``xml.sax`` parser factory.
+    """
+    parser = expat.ParserCreate()
+    # Deliver the text of an element in as few calls as possible.
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.startElement
+    parser.EndElementHandler = handler.endElement
+    parser.CharacterDataHandler = handler.characters
+    return parser
 
 
 class XmlHandlerWrapper(object):
+    """
+    Parses a document into an :class:`XmlHandler` with an expat parser,
+    whose callbacks go straight to the handler.  Malformed documents raise
+    ``xml.parsers.expat.ExpatError``.
+    """
+
     def __init__(self, root_node, connection):
         self.handler = XmlHandler(root_node, connection)
-        self.parser = xml.sax.make_parser()
-        self.parser.setContentHandler(self.handler)
-        self.parser.setFeature(xml.sax.handler.feature_external_ges, 0)
+        self.parser = _expat_parser(self.handler)
 
     def parseString(self, content):
-        return self.parser.parse(StringIO(content))
+        return self.parser.Parse(content, True)
+
+
+def _local_name(name):
+    # lxml reports namespaced names as '{uri}name', expat as plain 'name'.
+    return name.rpartition('}')[2]
+
+
+class XmlTarget(object):
+    """
+    lxml parser target that forwards parse events to an :class:`XmlHandler`,
+    so that the same handlers work with both lxml and expat.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def start(self, tag, attrib):
+        attrs = dict((_local_name(k), v) for k, v in attrib.items())
+        self.handler.startElement(_local_name(tag), attrs)
+
+    def end(self, tag):
+        self.handler.endElement(_local_name(tag))
+
+    def data(self, data):
+        self.handler.characters(data)
+
+    def close(self):
+        pass
+
+
+def parse_string(content, handler):
+    """
+    Parse the XML document in ``content`` into ``handler``, an
+    :class:`XmlHandler`.  lxml is used when it is installed, expat
+    otherwise.
+
+    ``content`` should be the raw response body as bytes, which both parsers
+    read directly, using the encoding declared by the document.
+    """
+    if etree is None:
+        _expat_parser(handler).Parse(content, True)
+    else:
+        parser = etree.XMLParser(target=XmlTarget(handler),
+                                 resolve_entities=False)
+        parser.feed(content)
+        parser.close()
@@ -29,7 +29,7 @@
 # OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-from txboto.regioninfo import get_regions
+from txboto.regioninfo import get_region, get_regions
 
 
 def regions():
@@ -44,7 +44,9 @@ def regions():
 
 
 def connect_to_region(region_name, **kw_params):
-    for region in regions():
-        if region.name == region_name:
-            return region.connect(**kw_params)
+    from txboto.kinesis.layer1 import KinesisConnection
+    region = get_region('kinesis', region_name,
+                        connection_cls=KinesisConnection)
+    if region is not None:
+        return region.connect(**kw_params)
     return None
@@ -36,7 +36,7 @@ import txboto
 
 from twisted.internet import defer
 
-from txboto.compat import json, to_str
+from txboto.compat import json_dumps, json_loads, to_str
 
 from txboto.regioninfo import RegionInfo
 
@@ -98,7 +98,7 @@ class KinesisConnection(AWSQueryConnection):
         """
         params = {'StreamName': stream_name, 'Tags': tags, }
         response = yield self.make_request(action='AddTagsToStream',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -174,7 +174,7 @@ class KinesisConnection(AWSQueryConnection):
             'ShardCount': shard_count,
         }
         response = yield self.make_request(action='CreateStream',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -210,7 +210,7 @@ class KinesisConnection(AWSQueryConnection):
         """
         params = {'StreamName': stream_name, }
         response = yield self.make_request(action='DeleteStream',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -262,7 +262,7 @@ class KinesisConnection(AWSQueryConnection):
         if exclusive_start_shard_id is not None:
             params['ExclusiveStartShardId'] = exclusive_start_shard_id
         response = yield self.make_request(action='DescribeStream',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -344,7 +344,7 @@ class KinesisConnection(AWSQueryConnection):
             params['Limit'] = limit
 
         response = yield self.make_request(action='GetRecords',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         # Base64 decode the data
         if b64_decode:
             for record in response.get('Records', []):
@@ -439,7 +439,7 @@ class KinesisConnection(AWSQueryConnection):
         if starting_sequence_number is not None:
             params['StartingSequenceNumber'] = starting_sequence_number
         response = yield self.make_request(action='GetShardIterator',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -480,7 +480,7 @@ class KinesisConnection(AWSQueryConnection):
         if exclusive_start_stream_name is not None:
             params['ExclusiveStartStreamName'] = exclusive_start_stream_name
         response = yield self.make_request(action='ListStreams',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -510,7 +510,7 @@ class KinesisConnection(AWSQueryConnection):
         if limit is not None:
             params['Limit'] = limit
         response = yield self.make_request(action='ListTagsForStream',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -580,7 +580,7 @@ class KinesisConnection(AWSQueryConnection):
             'AdjacentShardToMerge': adjacent_shard_to_merge,
         }
         response = yield self.make_request(action='MergeShards',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -685,7 +685,7 @@ class KinesisConnection(AWSQueryConnection):
                 params['Data'] = params['Data'].encode('utf-8')
             params['Data'] = base64.b64encode(params['Data']).decode('utf-8')
         response = yield self.make_request(action='PutRecord',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -775,7 +775,7 @@ class KinesisConnection(AWSQueryConnection):
                 params['Records'][i]['Data'] = base64.b64encode(
                     data).decode('utf-8')
         response = yield self.make_request(action='PutRecords',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -795,7 +795,7 @@ class KinesisConnection(AWSQueryConnection):
         """
         params = {'StreamName': stream_name, 'TagKeys': tag_keys, }        
         response = yield self.make_request(action='RemoveTagsFromStream',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -880,7 +880,7 @@ class KinesisConnection(AWSQueryConnection):
             'NewStartingHashKey': new_starting_hash_key,
         }
         response = yield self.make_request(action='SplitShard',
-                                           body=json.dumps(params))
+                                           body=json_dumps(params))
         defer.returnValue(response)
 
     @defer.inlineCallbacks
@@ -900,9 +900,9 @@ class KinesisConnection(AWSQueryConnection):
         txboto.log.debug(response_body)
         if response.code == 200:
             if response_body:
-                defer.returnValue(json.loads(to_str(response_body)))
+                defer.returnValue(json_loads(to_str(response_body)))
         else:
-            json_body = json.loads(to_str(response_body))
+            json_body = json_loads(to_str(response_body))
             fault_name = json_body.get('__type', None)
             exception_class = self._faults.get(fault_name, self.ResponseError)
             raise exception_class(response.code, response.reason,
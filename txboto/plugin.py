@@ -46,8 +46,19 @@ The actual interface is duck typed.
 """
 
 import glob
-import imp
 import os.path
+import sys
+
+try:
+    from importlib.util import module_from_spec, spec_from_file_location
+except ImportError:
+    # Python 2 only has imp.
+    import imp
+    spec_from_file_location = None
+
+
+# The capabilities of each plugin class, frozen on first use.
+_capabilities = {}
 
 
 class Plugin(object):
@@ -59,32 +70,56 @@ class Plugin(object):
     def is_capable(cls, requested_capability):
         """Returns true if the requested capability is supported by this plugin
         """
-        for c in requested_capability:
-            if c not in cls.capability:
-                return False
-        return True
+        capabilities = _capabilities.get(cls)
+        if capabilities is None:
+            capabilities = _capabilities[cls] = frozenset(cls.capability)
+        return capabilities.issuperset(requested_capability)
+
+
+# get_plugin results, keyed by the plugin class and the requested
+# capabilities, along with the number of subclasses they were found among so
+# that plugins defined later are still found.  Reset by load_plugins and once
+# it holds _PLUGIN_CACHE_SIZE entries.
+_plugin_cache = {}
+_PLUGIN_CACHE_SIZE = 128
 
 
 def get_plugin(cls, requested_capability=None):
-    if not requested_capability:
-        requested_capability = []
-    result = []
-    for handler in cls.__subclasses__():
-        if handler.is_capable(requested_capability):
-            result.append(handler)
-    return result
+    requested_capability = frozenset(requested_capability or ())
+    handlers = cls.__subclasses__()
+    key = (cls, requested_capability)
+    entry = _plugin_cache.get(key)
+    if entry is None or entry[0] != len(handlers):
+        if len(_plugin_cache) >= _PLUGIN_CACHE_SIZE:
+            _plugin_cache.clear()
+        entry = _plugin_cache[key] = (len(handlers), [
+            handler for handler in handlers
+            if handler.is_capable(requested_capability)])
+    return list(entry[1])
 
 
 def _import_module(filename):
     (path, name) = os.path.split(filename)
     (name, ext) = os.path.splitext(name)
 
-    (file, filename, data) = imp.find_module(name, [path])
+    if spec_from_file_location is None:
+        (file, filename, data) = imp.find_module(name, [path])
+        try:
+            return imp.load_module(name, file, filename, data)
+        finally:
+            if file:
+                file.close()
+
+    spec = spec_from_file_location(name, filename)
+    module = module_from_spec(spec)
+    # Registered before running it, as imp.load_module did.
+    sys.modules[name] = module
     try:
-        return imp.load_module(name, file, filename, data)
-    finally:
-        if file:
-            file.close()
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
 
 _plugin_loaded = False
 
@@ -94,6 +129,7 @@ def load_plugins(config):
     if _plugin_loaded:
         return
     _plugin_loaded = True
+    _plugin_cache.clear()
 
     if not config.has_option('Plugin', 'plugin_directory'):
         return
@@ -210,15 +210,28 @@ class Provider(object):
         self.configure_errors()
 
         # Allow config file to override default host and port.
-        host_opt_name = '%s_host' % self.HostKeyMap[self.name]
+        self.host, self.port, self.host_header = \
+            self.get_endpoint_overrides(self.name)
+
+    @classmethod
+    def get_endpoint_overrides(cls, name):
+        """
+        Return the ``(host, port, host_header)`` configured for provider
+        ``name`` in the Credentials section, with ``None`` for unset values.
+        This only reads the config, so it can be used without building a
+        Provider.
+        """
+        host = port = host_header = None
+        host_opt_name = '%s_host' % cls.HostKeyMap[name]
         if config.has_option('Credentials', host_opt_name):
-            self.host = config.get('Credentials', host_opt_name)
-        port_opt_name = '%s_port' % self.HostKeyMap[self.name]
+            host = config.get('Credentials', host_opt_name)
+        port_opt_name = '%s_port' % cls.HostKeyMap[name]
         if config.has_option('Credentials', port_opt_name):
-            self.port = config.getint('Credentials', port_opt_name)
-        host_header_opt_name = '%s_host_header' % self.HostKeyMap[self.name]
+            port = config.getint('Credentials', port_opt_name)
+        host_header_opt_name = '%s_host_header' % cls.HostKeyMap[name]
         if config.has_option('Credentials', host_header_opt_name):
-            self.host_header = config.get('Credentials', host_header_opt_name)
+            host_header = config.get('Credentials', host_header_opt_name)
+        return host, port, host_header
 
     def get_access_key(self):
         if self._credentials_need_refresh():
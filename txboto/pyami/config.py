@@ -39,26 +39,59 @@ from txboto.compat import expanduser, ConfigParser, StringIO
 # By default we use two locations for the txboto configurations,
 # /etc/boto.cfg and ~/.boto (which works on Windows and Unix).
 TxBotoConfigPath = '/etc/txboto.cfg'
-TxBotoConfigLocations = [TxBotoConfigPath]
 UserConfigPath = os.path.join(expanduser('~'), '.txboto')
-TxBotoConfigLocations.append(UserConfigPath)
 
-# If there's a TXBOTO_CONFIG variable set, we load ONLY
-# that variable
-if 'TXBOTO_CONFIG' in os.environ:
-    TxBotoConfigLocations = [expanduser(os.environ['TXBOTO_CONFIG'])]
 
-# If there's a TXBOTO_PATH variable set, we use anything there
-# as the current configuration locations, split with os.pathsep.
-elif 'TXBOTO_PATH' in os.environ:
-    TxBotoConfigLocations = []
-    for path in os.environ['TXBOTO_PATH'].split(os.pathsep):
-        TxBotoConfigLocations.append(expanduser(path))
+def _config_locations(environ):
+    """
+    Returns the list of configuration files to load given the environment
+    variables in ``environ``.
+    """
+    # If there's a TXBOTO_CONFIG variable set, we load ONLY
+    # that variable
+    if 'TXBOTO_CONFIG' in environ:
+        return [expanduser(environ['TXBOTO_CONFIG'])]
+
+    # If there's a TXBOTO_PATH variable set, we use anything there
+    # as the current configuration locations, split with os.pathsep.
+    if 'TXBOTO_PATH' in environ:
+        return [expanduser(path)
+                for path in environ['TXBOTO_PATH'].split(os.pathsep)]
+
+    return [TxBotoConfigPath, UserConfigPath]
+
+
+# Worked out once, when this module is imported: changing TXBOTO_CONFIG or
+# TXBOTO_PATH afterwards does not affect the files new Configs load, but
+# this list can be changed in place.
+TxBotoConfigLocations = _config_locations(os.environ)
+
+# Matches the "#import other.cfg" lines handled by Config.load_from_path.
+_IMPORT_RE = re.compile(r'^#import\s+(\S+)\s*$')
+
+# Key names of Java-style credential files, renamed by
+# Config.load_credential_file in a single pass.
+_CREDENTIAL_NAMES = {
+    'AWSAccessKeyId': 'aws_access_key_id',
+    'AWSSecretKey': 'aws_secret_access_key',
+}
+_CREDENTIAL_RE = re.compile('|'.join(_CREDENTIAL_NAMES))
+
+
+def _credential_name(match):
+    return _CREDENTIAL_NAMES[match.group(0)]
+
+
+# Marks options looked up and found missing in Config._cache.
+_MISSING = object()
 
 
 class Config(ConfigParser):
 
     def __init__(self, path=None, fp=None, do_load=True):
+        # Looked up (section, name) values, and (section, name, type) for the
+        # converted ones. Cleared whenever the configuration changes.
+        self._cache = {}
         # We don't use ``super`` here, because ``ConfigParser`` still uses
         # old-style classes.
         ConfigParser.__init__(self, {'working_dir': '/mnt/pyami',
@@ -80,23 +113,22 @@ class Config(ConfigParser):
 
     def load_credential_file(self, path):
         """Load a credential file as is setup like the Java utilities"""
-        c_data = StringIO()
-        c_data.write("[Credentials]\n")
-        for line in open(path, "r").readlines():
-            c_data.write(
-                line.replace("AWSAccessKeyId", "aws_access_key_id").replace(
-                    "AWSSecretKey", "aws_secret_access_key"))
-        c_data.seek(0)
-        self.readfp(c_data)
+        with open(path, "r") as fp:
+            c_data = "[Credentials]\n" + _CREDENTIAL_RE.sub(
+                _credential_name, fp.read())
+        if hasattr(self, 'read_string'):
+            self.read_string(c_data, path)
+        else:
+            # Python 2's ConfigParser can only read from files.
+            self.readfp(StringIO(c_data), path)
 
     def load_from_path(self, path):
-        file = open(path)
-        for line in file.readlines():
-            match = re.match("^#import[\s\t]*([^\s^\t]*)[\s\t]*$", line)
-            if match:
-                extended_file = match.group(1)
-                (dir, file) = os.path.split(path)
-                self.load_from_path(os.path.join(dir, extended_file))
+        dir = os.path.dirname(path)
+        with open(path) as fp:
+            for line in fp:
+                match = _IMPORT_RE.match(line)
+                if match:
+                    self.load_from_path(os.path.join(dir, match.group(1)))
         self.read(path)
 
     def save_option(self, path, section, option, value):
@@ -147,37 +179,65 @@ class Config(ConfigParser):
     def get_value(self, section, name, default=None):
         return self.get(section, name, default)
 
-    def get(self, section, name, default=None):
+    def _read(self, fp, fpname):
+        self._cache.clear()
+        return ConfigParser._read(self, fp, fpname)
+
+    def set(self, section, option, value=None):
+        self._cache.clear()
+        return ConfigParser.set(self, section, option, value)
+
+    def remove_option(self, section, option):
+        self._cache.clear()
+        return ConfigParser.remove_option(self, section, option)
+
+    def remove_section(self, section):
+        self._cache.clear()
+        return ConfigParser.remove_section(self, section)
+
+    def get(self, section, name, default=None, **kwargs):
+        if kwargs:
+            # Python 3's ConfigParser calls get with raw, vars or fallback
+            # for its own lookups, which expect the standard behaviour.
+            return ConfigParser.get(self, section, name, **kwargs)
+        key = (section, name)
         try:
-            val = ConfigParser.get(self, section, name)
-        except:
-            val = default
+            val = self._cache[key]
+        except KeyError:
+            try:
+                val = ConfigParser.get(self, section, name)
+            except:
+                val = _MISSING
+            self._cache[key] = val
+        if val is _MISSING:
+            return default
         return val
 
-    def getint(self, section, name, default=0):
+    def _get_converted(self, section, name, conv, default):
+        key = (section, name, conv)
         try:
-            val = ConfigParser.getint(self, section, name)
-        except:
-            val = int(default)
+            val = self._cache[key]
+        except KeyError:
+            try:
+                val = conv(ConfigParser.get(self, section, name))
+            except:
+                val = _MISSING
+            self._cache[key] = val
+        if val is _MISSING:
+            return conv(default)
         return val
 
+    def getint(self, section, name, default=0):
+        return self._get_converted(section, name, int, default)
+
     def getfloat(self, section, name, default=0.0):
-        try:
-            val = ConfigParser.getfloat(self, section, name)
-        except:
-            val = float(default)
-        return val
+        return self._get_converted(section, name, float, default)
 
     def getbool(self, section, name, default=False):
-        if self.has_option(section, name):
-            val = self.get(section, name)
-            if val.lower() == 'true':
-                val = True
-            else:
-                val = False
-        else:
-            val = default
-        return val
+        val = self.get(section, name, _MISSING)
+        if val is _MISSING:
+            return default
+        return val.lower() == 'true'
 
     def setbool(self, section, name, value):
         if value:
@@ -33,7 +33,7 @@
 import os
 
 import txboto
-from txboto.compat import json
+from txboto.compat import json_loads
 from txboto.exception import BotoClientError
 
 
@@ -46,8 +46,10 @@ def load_endpoint_json(path):
 
     :returns: The loaded data
     """
-    with open(path, 'r') as endpoints_file:
-        return json.load(endpoints_file)
+    # Unbuffered, so the whole file is read straight into a single bytes
+    # object.
+    with open(path, 'rb', buffering=0) as endpoints_file:
+        return json_loads(endpoints_file.read())
 
 
 def merge_endpoints(defaults, additions):
@@ -67,14 +69,32 @@ def merge_endpoints(defaults, additions):
     # We can't just do an ``defaults.update(...)`` here, as that could
     # *overwrite* regions if present in both.
     # We'll iterate instead, essentially doing a deeper merge.
+    get_service = defaults.get
     for service, region_info in additions.items():
-        # Set the default, if not present, to an empty dict.
-        defaults.setdefault(service, {})
-        defaults[service].update(region_info)
+        existing = get_service(service)
+        if existing is None:
+            defaults[service] = dict(region_info)
+        else:
+            existing.update(region_info)
 
     return defaults
 
 
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# The last endpoints data returned by load_regions, with the files it was
+# loaded from and their modification times.
+_loaded_endpoints = (None, None)
+# The same for the default endpoints file alone, which is kept while only
+# the additional file changes.
+_default_endpoints = (None, None)
+
+
 def load_regions():
     """
     Actually load the region/endpoint information from the JSON files.
@@ -82,29 +102,44 @@ def load_regions():
     By default, this loads from the default included ``txboto/endpoints.json``
     file.
 
-    Users can override/extend this by supplying either a ``txboto_ENDPOINTS``
+    Users can override/extend this by supplying either a ``TXBOTO_ENDPOINTS``
     environment variable or a ``endpoints_path`` config variable, either of
     which should be an absolute path to the user's JSON file.
 
+    The data is only loaded again once one of the files changed, so the
+    same dict is returned until then and it should not be modified.
+
     :returns: The endpoints data
     :rtype: dict
     """
-    # Load the defaults first.
-    endpoints = load_endpoint_json(txboto.ENDPOINTS_PATH)
-    additional_path = None
-
+    global _loaded_endpoints, _default_endpoints
     # Try the ENV var. If not, check the config file.
-    if os.environ.get('TXBOTO_ENDPOINTS'):
-        additional_path = os.environ['BOTO_ENDPOINTS']
-    elif txboto.config.get('TxBoto', 'endpoints_path'):
-        additional_path = txboto.config.get('TxBoto', 'endpoints_path')
+    additional_path = (os.environ.get('TXBOTO_ENDPOINTS') or
+                       txboto.config.get('TxBoto', 'endpoints_path'))
+
+    key = (txboto.ENDPOINTS_PATH, _mtime(txboto.ENDPOINTS_PATH),
+           additional_path, additional_path and _mtime(additional_path))
+    if _loaded_endpoints[0] == key:
+        return _loaded_endpoints[1]
+
+    # Load the defaults first.
+    if _default_endpoints[0] == key[:2]:
+        endpoints = _default_endpoints[1]
+    else:
+        endpoints = load_endpoint_json(txboto.ENDPOINTS_PATH)
+        _default_endpoints = (key[:2], endpoints)
 
     # If there's a file provided, we'll load it & additively merge it into
-    # the endpoints.
+    # the endpoints. The defaults are kept as they are, so the merge goes
+    # into a copy of them, made once here.
     if additional_path:
         additional = load_endpoint_json(additional_path)
-        endpoints = merge_endpoints(endpoints, additional)
+        endpoints = merge_endpoints(
+            dict((service, dict(regions))
+                 for service, regions in endpoints.items()),
+            additional)
 
+    _loaded_endpoints = (key, endpoints)
     return endpoints
 
 
@@ -132,9 +167,23 @@ def get_regions(service_name, region_cls=None, connection_cls=None):
     :returns: A list of configured ``RegionInfo`` objects
     :rtype: list
     """
+    return list(get_regions_map(service_name, region_cls=region_cls,
+                                connection_cls=connection_cls).values())
+
+
+def get_regions_map(service_name, region_cls=None, connection_cls=None):
+    """
+    Same as :func:`get_regions`, but returns the ``RegionInfo`` objects in a
+    dict keyed by region name, for callers looking regions up by name.
+
+    :returns: A dict mapping region names to configured ``RegionInfo`` objects
+    :rtype: dict
+    """
     endpoints = load_regions()
 
-    if service_name not in endpoints:
+    try:
+        service_endpoints = endpoints[service_name]
+    except KeyError:
         raise BotoClientError(
             "Service '%s' not found in endpoints." % service_name
         )
@@ -142,18 +191,49 @@ def get_regions(service_name, region_cls=None, connection_cls=None):
     if region_cls is None:
         region_cls = RegionInfo
 
-    region_objs = []
+    return {
+        region_name: region_cls(
+            name=region_name,
+            endpoint=endpoint,
+            connection_cls=connection_cls
+        )
+        for region_name, endpoint in service_endpoints.items()
+    }
+
+
+def get_region(service_name, region_name, region_cls=None,
+               connection_cls=None):
+    """
+    Given a service name & a region name, returns the ``RegionInfo`` object
+    for that region, without building the objects of all the other regions
+    like :func:`get_regions` does.
+
+    Takes the same optional arguments as :func:`get_regions`.
+
+    :returns: A configured ``RegionInfo`` object, or ``None`` if the service
+        has no such region
+    :rtype: :class:`RegionInfo`
+    """
+    endpoints = load_regions()
 
-    for region_name, endpoint in endpoints.get(service_name, {}).items():
-        region_objs.append(
-            region_cls(
-                name=region_name,
-                endpoint=endpoint,
-                connection_cls=connection_cls
-            )
+    try:
+        endpoint = endpoints[service_name].get(region_name)
+    except KeyError:
+        raise BotoClientError(
+            "Service '%s' not found in endpoints." % service_name
         )
 
-    return region_objs
+    if endpoint is None:
+        return None
+
+    if region_cls is None:
+        region_cls = RegionInfo
+
+    return region_cls(
+        name=region_name,
+        endpoint=endpoint,
+        connection_cls=connection_cls
+    )
 
 
 class RegionInfo(object):
@@ -161,6 +241,11 @@ class RegionInfo(object):
     Represents an AWS Region
     """
 
+    # __dict__ keeps room for the unknown XML elements endElement stores;
+    # it is only allocated when one of them is actually set.
+    __slots__ = ('connection', 'name', 'endpoint', 'connection_cls',
+                 '__dict__')
+
     def __init__(self, connection=None, name=None, endpoint=None,
                  connection_cls=None):
         self.connection = connection